@@ -14,6 +14,12 @@ def create_app(config_name='default'):
     db.init_app(app)
     CORS(app)  # 允许前端跨域访问
     
+    # 部署在反向代理之后时，按受信任的代理层数从 X-Forwarded-For 取客户端 IP
+    proxy_count = app.config.get('TRUSTED_PROXY_COUNT', 0)
+    if proxy_count > 0:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_count, x_proto=proxy_count)
+    
     # 获取前端文件目录的绝对路径（D:\wordup）
     frontend_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
     
@@ -49,6 +55,7 @@ def create_app(config_name='default'):
     from .routes.classes import classes_bp
     from .routes.tasks import tasks_bp
     from .routes.scores import scores_bp
+    from .routes.export import export_bp
     
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(words_bp, url_prefix='/api/words')
@@ -56,9 +63,31 @@ def create_app(config_name='default'):
     app.register_blueprint(classes_bp, url_prefix='/api/classes')
     app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
     app.register_blueprint(scores_bp, url_prefix='/api/scores')
+    app.register_blueprint(export_bp, url_prefix='/api/export')
+    
+    # 缓存与失效通道
+    from .utils.cache import configure_invalidation_bus
+    from .services.word_service import word_cache
+    from .services.fuzzy_index import word_fuzzy_index
+    from .utils.passwords import password_hasher
+    from .utils.admission import login_admission
+    from .services.user_service import user_profile_cache
+    from .services.id_allocator import id_allocator
+    from .services.class_service import class_dashboard_cache
+    from .services.task_publisher import task_publisher
+    configure_invalidation_bus(app)
+    word_cache.configure(app.config)
+    word_fuzzy_index.configure(app.config)
+    password_hasher.configure(app.config)
+    login_admission.configure(app.config)
+    login_admission.configure_store(app)
+    user_profile_cache.configure(app.config)
+    id_allocator.configure(app.config)
+    class_dashboard_cache.configure(app.config)
+    task_publisher.configure(app.config)
     
-    # 创建数据库表
-    with app.app_context():
-        db.create_all()
+    # 创建数据库表，并为已有表补充新增的列和索引
+    from .utils.database import init_db
+    init_db(app)
     
     return app
\ No newline at end of file
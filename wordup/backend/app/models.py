@@ -1,6 +1,13 @@
 from app import db
+from app.utils.helpers import normalize_content, pack_ids, unpack_ids
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy import event, func, inspect
+from sqlalchemy.orm import validates
+from app.utils.passwords import password_hasher
+
+def _default_content_key(context):
+    """Core 批量插入未显式提供 content_key 时由 content 推导"""
+    return normalize_content(context.get_current_parameters().get('content'))
 
 class Student(db.Model):
     __tablename__ = 'student'
@@ -13,13 +20,17 @@ class Student(db.Model):
     
     # 关系
     scores = db.relationship('Score', backref='student', lazy=True)
+    assignments = db.relationship('StudentTask', backref='student', lazy=True, cascade='all, delete-orphan')
     wrong_books = db.relationship('WrongBook', backref='student', lazy=True)
     
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password)
+    
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password)
 
 class Teacher(db.Model):
     __tablename__ = 'teacher'
@@ -33,10 +44,13 @@ class Teacher(db.Model):
     classes = db.relationship('Class', backref='head_teacher', lazy=True)
     
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password)
+    
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password)
 
 class Word(db.Model):
     __tablename__ = 'word'
@@ -46,6 +60,27 @@ class Word(db.Model):
     meaning = db.Column(db.Text, nullable=False)
     speech = db.Column(db.String(20))
     is_wrong = db.Column(db.Boolean)  # 注意：MySQL中的tinyint(1)映射为Boolean
+    # 规范化后的拼写（小写、去首尾空白），唯一索引保证单词不重复
+    content_key = db.Column(db.String(100), unique=True, index=True, default=_default_content_key)
+    
+    @validates('content')
+    def _sync_content_key(self, key, value):
+        self.content_key = normalize_content(value)
+        return value
+
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_version'
+    
+    # 数据目录名（如 word），每次该目录的数据变更时 version 加一，用作 ETag
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+class IdCounter(db.Model):
+    __tablename__ = 'id_counter'
+    
+    # 用户类型（student / teacher / admin），next_value 为下一个尚未分配出去的编号
+    name = db.Column(db.String(50), primary_key=True)
+    next_value = db.Column(db.BigInteger, nullable=False)
 
 class Task(db.Model):
     __tablename__ = 'task'
@@ -55,9 +90,50 @@ class Task(db.Model):
     description = db.Column(db.Text)
     start_time = db.Column(db.DateTime, nullable=False)
     end_time = db.Column(db.DateTime, nullable=False)
+    # 任务单词表：按顺序打包的 word_id 数组（每个 4 字节），不为每个单词单独建行
+    word_ids = db.Column(db.LargeBinary)
+    word_count = db.Column(db.Integer, default=0)
+    # 向学生扇出布置记录的状态：pending / running / done / failed，未发布时为 NULL
+    publish_status = db.Column(db.String(20))
+    assigned_count = db.Column(db.Integer, default=0)
+    publish_error = db.Column(db.String(255))
+    # 发布被认领或最近一次取得进展的时间，既是租约的起点，也用来识别当前持有发布权的执行者
+    publish_started_at = db.Column(db.DateTime)
     
     # 关系
     scores = db.relationship('Score', backref='task', lazy=True)
+    
+    def set_word_ids(self, word_ids):
+        self.word_ids = pack_ids(word_ids)
+        self.word_count = len(word_ids)
+    
+    def get_word_ids(self):
+        return unpack_ids(self.word_ids)
+    
+    # 按开始时间（未开始的任务）、按截止时间（进行中/已结束的任务）做范围扫描，
+    # 另一个时间列放在索引内，窗口条件无需回表即可过滤
+    __table_args__ = (
+        db.Index('ix_task_start_end', 'start_time', 'end_time'),
+        db.Index('ix_task_end_start', 'end_time', 'start_time'),
+    )
+
+class TaskClass(db.Model):
+    """任务布置到的班级"""
+    __tablename__ = 'task_class'
+    
+    task_id = db.Column(db.Integer, db.ForeignKey('task.task_id'), primary_key=True)
+    class_id = db.Column(db.String(20), db.ForeignKey('class.class_id'), primary_key=True, index=True)
+
+class StudentTask(db.Model):
+    """布置给每个学生的任务及其进度"""
+    __tablename__ = 'student_task'
+    
+    task_id = db.Column(db.Integer, db.ForeignKey('task.task_id'), primary_key=True)
+    student_id = db.Column(db.String(20), db.ForeignKey('student.student_id'), primary_key=True, index=True)
+    status = db.Column(db.String(20), nullable=False, default='not_started')
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    assigned_at = db.Column(db.DateTime)
+    completed_at = db.Column(db.DateTime)
 
 class Class(db.Model):
     __tablename__ = 'class'
@@ -70,6 +146,46 @@ class Class(db.Model):
     # 关系
     students = db.relationship('Student', backref='class_info', lazy=True)
 
+def _adjust_student_count(connection, class_id, delta):
+    """在学生写入的同一事务中增减班级人数"""
+    if class_id is None:
+        return
+    table = Class.__table__
+    connection.execute(
+        table.update().where(table.c.class_id == class_id)
+        .values(student_count=func.coalesce(table.c.student_count, 0) + delta)
+    )
+
+# 通过 ORM 新增、删除、转班的学生都会同步 Class.student_count；
+# Core 批量写入（如名单导入）不触发这些事件，需自行更新人数
+@event.listens_for(Student, 'after_insert')
+def _student_inserted(mapper, connection, student):
+    _adjust_student_count(connection, student.class_id, 1)
+
+@event.listens_for(Student, 'after_delete')
+def _student_deleted(mapper, connection, student):
+    history = inspect(student).attrs.class_id.history
+    _adjust_student_count(connection, history.deleted[0] if history.deleted else student.class_id, -1)
+
+@event.listens_for(Student, 'after_update')
+def _student_updated(mapper, connection, student):
+    history = inspect(student).attrs.class_id.history
+    if not history.has_changes():
+        return
+    old_class_id = history.deleted[0] if history.deleted else None
+    if old_class_id != student.class_id:
+        _adjust_student_count(connection, old_class_id, -1)
+        _adjust_student_count(connection, student.class_id, 1)
+
+# 通过 ORM 删除的布置记录（包括删除学生时的级联删除）同步减少 Task.assigned_count
+@event.listens_for(StudentTask, 'after_delete')
+def _assignment_deleted(mapper, connection, assignment):
+    table = Task.__table__
+    connection.execute(
+        table.update().where(table.c.task_id == assignment.task_id, table.c.assigned_count > 0)
+        .values(assigned_count=table.c.assigned_count - 1)
+    )
+
 class WrongBook(db.Model):
     __tablename__ = 'wrong_book'
     
@@ -99,7 +215,10 @@ class Admin(db.Model):
     updated_at = db.Column(db.DateTime, default=db.func.current_timestamp(), onupdate=db.func.current_timestamp())
     
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = password_hasher.hash(password)
     
     def check_password(self, password):
-        return check_password_hash(self.password, password)
\ No newline at end of file
+        return password_hasher.verify(self.password, password)
+    
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password)
\ No newline at end of file
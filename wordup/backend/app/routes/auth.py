@@ -1,11 +1,17 @@
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, g, current_app
+from itsdangerous import BadSignature, SignatureExpired
 from app.models import Student, Teacher, Admin
 from app.services.auth_service import AuthService
+from app.services.user_service import UserService, USER_MODELS
+from app.utils.admission import login_admission
 from app.utils.helpers import success_response, error_response
+from app.utils.tokens import issue_token, verify_token, bearer_token, auth_required
 from app import db
 
 auth_bp = Blueprint('auth', __name__)
 
+USER_TYPE_NAMES = {'student': '学生', 'teacher': '教师', 'admin': '管理员'}
+
 @auth_bp.route('/login', methods=['POST'])
 def login():
     """用户登录"""
@@ -18,56 +24,73 @@ def login():
     password = data['password']
     user_type = data.get('user_type', 'student')  # student, teacher 或 admin
     
-    try:
-        if user_type == 'student':
-            user = AuthService.authenticate_student(account, password)
-            user_info = {
-                'user_id': user.student_id,
-                'name': user.name,
-                'account': user.account,
-                'user_type': 'student',
-                'class_id': user.class_id
-            } if user else None
-        elif user_type == 'teacher':
-            user = AuthService.authenticate_teacher(account, password)
-            user_info = {
-                'user_id': user.teacher_id,
-                'name': user.name,
-                'account': user.account,
-                'user_type': 'teacher'
-            } if user else None
-        elif user_type == 'admin':
-            user = AuthService.authenticate_admin(account, password)
-            user_info = {
-                'user_id': user.admin_id,
-                'name': user.name,
-                'account': user.account,
-                'user_type': 'admin',
-                'email': user.email,
-                'phone': user.phone
-            } if user else None
-        else:
-            return error_response('无效的用户类型')
-        
-        if user:
-            # 存储用户信息到session
-            session['user_id'] = user_info['user_id']
-            session['user_type'] = user_type
-            session['user_name'] = user_info['name']
-            
-            return success_response(user_info, '登录成功')
-        else:
-            return error_response('账号或密码错误', 401)
+    # 先过接入控制，超限直接 429，不进入昂贵的密码校验
+    with login_admission.admit(f'{user_type}:{account}', request.remote_addr) as rejected:
+        if rejected:
+            response = error_response('登录请求过于频繁，请稍后再试', 429)
+            return response[0], 429, {'Retry-After': str(login_admission.retry_after(rejected))}
+        
+        try:
+            if user_type == 'student':
+                user = AuthService.authenticate_student(account, password)
+                user_info = {
+                    'user_id': user.student_id,
+                    'name': user.name,
+                    'account': user.account,
+                    'user_type': 'student',
+                    'class_id': user.class_id
+                } if user else None
+            elif user_type == 'teacher':
+                user = AuthService.authenticate_teacher(account, password)
+                user_info = {
+                    'user_id': user.teacher_id,
+                    'name': user.name,
+                    'account': user.account,
+                    'user_type': 'teacher'
+                } if user else None
+            elif user_type == 'admin':
+                user = AuthService.authenticate_admin(account, password)
+                user_info = {
+                    'user_id': user.admin_id,
+                    'name': user.name,
+                    'account': user.account,
+                    'user_type': 'admin',
+                    'email': user.email,
+                    'phone': user.phone
+                } if user else None
+            else:
+                return error_response('无效的用户类型')
+        
+            if user:
+                # 存储用户信息到session
+                session['user_id'] = user_info['user_id']
+                session['user_type'] = user_type
+                session['user_name'] = user_info['name']
+                session['class_id'] = user_info.get('class_id')
+                
+                # 签发短期令牌，后续请求携带 Authorization: Bearer 即可免查库校验身份
+                user_info['token'], user_info['expires_in'] = issue_token(
+                    user_info['user_id'], user_type, user_info.get('class_id')
+                )
+                
+                return success_response(user_info, '登录成功')
+            else:
+                return error_response('账号或密码错误', 401)
             
-    except Exception as e:
-        return error_response(f'登录失败: {str(e)}')
+        except Exception as e:
+            return error_response(f'登录失败: {str(e)}')
+
+@auth_bp.route('/login/stats', methods=['GET'])
+def login_stats():
+    """登录接入控制统计（被限流拒绝的请求数）"""
+    return success_response(login_admission.stats())
 
 @auth_bp.route('/register/student', methods=['POST'])
 def register_student():
-    """学生注册"""
+    """学生注册（编号可省略，由系统分配）"""
     data = request.json
     
-    required_fields = ['student_id', 'name', 'account', 'password']
+    required_fields = ['name', 'account', 'password']
     for field in required_fields:
         if not data.get(field):
             return error_response(f'缺少必需字段: {field}')
@@ -96,10 +119,10 @@ def register_student():
 
 @auth_bp.route('/register/teacher', methods=['POST'])
 def register_teacher():
-    """教师注册"""
+    """教师注册（编号可省略，由系统分配）"""
     data = request.json
     
-    required_fields = ['teacher_id', 'name', 'account', 'password']
+    required_fields = ['name', 'account', 'password']
     for field in required_fields:
         if not data.get(field):
             return error_response(f'缺少必需字段: {field}')
@@ -127,10 +150,10 @@ def register_teacher():
 
 @auth_bp.route('/register/admin', methods=['POST'])
 def register_admin():
-    """管理员注册"""
+    """管理员注册（编号可省略，由系统分配）"""
     data = request.json
     
-    required_fields = ['admin_id', 'name', 'account', 'password']
+    required_fields = ['name', 'account', 'password']
     for field in required_fields:
         if not data.get(field):
             return error_response(f'缺少必需字段: {field}')
@@ -164,51 +187,52 @@ def logout():
     session.clear()
     return success_response(None, '登出成功')
 
+@auth_bp.route('/refresh', methods=['POST'])
+def refresh_token():
+    """续期令牌：在 AUTH_TOKEN_REFRESH_TTL 内的令牌（即使已过期）可换取新令牌"""
+    token = bearer_token()
+    if not token:
+        return error_response('未提供令牌', 401)
+    
+    try:
+        claims = verify_token(token, max_age=current_app.config.get('AUTH_TOKEN_REFRESH_TTL', 7 * 24 * 3600))
+    except SignatureExpired:
+        return error_response('令牌已超过可续期时间，请重新登录', 401)
+    except BadSignature:
+        return error_response('无效的令牌', 401)
+    
+    try:
+        # 续期时才查一次库，确认用户仍然存在并取最新班级
+        model = USER_MODELS.get(claims['user_type'])
+        user = db.session.get(model, claims['user_id']) if model else None
+        if not user:
+            return error_response('用户不存在', 401)
+        
+        token, expires_in = issue_token(claims['user_id'], claims['user_type'], getattr(user, 'class_id', None))
+        return success_response({'token': token, 'expires_in': expires_in}, '令牌已续期')
+    except Exception as e:
+        return error_response(f'续期令牌失败: {str(e)}')
+
+@auth_bp.route('/me/cache/stats', methods=['GET'])
+def profile_cache_stats():
+    """用户资料缓存统计（命中率）"""
+    return success_response(UserService.profile_cache_stats())
+
 @auth_bp.route('/me', methods=['GET'])
+@auth_required()
 def get_current_user():
     """获取当前用户信息"""
-    user_id = session.get('user_id')
-    user_type = session.get('user_type')
+    user_id = g.current_user['user_id']
+    user_type = g.current_user['user_type']
     
-    if not user_id or not user_type:
-        return error_response('未登录', 401)
+    if user_type not in USER_MODELS:
+        return error_response('无效的用户类型', 400)
     
     try:
-        if user_type == 'student':
-            user = Student.query.get(user_id)
-            if not user:
-                return error_response('学生用户不存在', 404)
-            user_info = {
-                'user_id': user.student_id,
-                'name': user.name,
-                'account': user.account,
-                'user_type': 'student',
-                'class_id': user.class_id
-            }
-        elif user_type == 'teacher':
-            user = Teacher.query.get(user_id)
-            if not user:
-                return error_response('教师用户不存在', 404)
-            user_info = {
-                'user_id': user.teacher_id,
-                'name': user.name,
-                'account': user.account,
-                'user_type': 'teacher'
-            }
-        elif user_type == 'admin':
-            user = Admin.query.get(user_id)
-            if not user:
-                return error_response('管理员用户不存在', 404)
-            user_info = {
-                'user_id': user.admin_id,
-                'name': user.name,
-                'account': user.account,
-                'user_type': 'admin',
-                'email': user.email,
-                'phone': user.phone
-            }
-        else:
-            return error_response('无效的用户类型', 400)
+        # 资料走 TTL + LRU 缓存，用户修改/删除时失效
+        user_info = UserService.get_profile(user_type, user_id)
+        if not user_info:
+            return error_response(f'{USER_TYPE_NAMES[user_type]}用户不存在', 404)
         
         return success_response(user_info)
     except Exception as e:
@@ -1,5 +1,6 @@
 from flask import Blueprint, request, jsonify
 from app.models import Class
+from app.services.class_service import ClassService
 from app.utils.helpers import success_response, error_response
 
 classes_bp = Blueprint('classes', __name__)
@@ -19,4 +20,63 @@ def get_classes():
         return success_response(classes_data)
         
     except Exception as e:
-        return error_response(f'获取班级列表失败: {str(e)}')
\ No newline at end of file
+        return error_response(f'获取班级列表失败: {str(e)}')
+
+@classes_bp.route('/<class_id>/students', methods=['GET'])
+def get_class_students(class_id):
+    """获取班级学生名单"""
+    try:
+        cls, students = ClassService.get_class_students(class_id)
+        if not cls:
+            return error_response('班级不存在', 404)
+        
+        return success_response({
+            'class_id': cls.class_id,
+            'class_name': cls.class_name,
+            'student_count': len(students),
+            'students': students
+        })
+        
+    except Exception as e:
+        return error_response(f'获取班级学生失败: {str(e)}')
+
+@classes_bp.route('/reconcile-counts', methods=['POST'])
+def reconcile_student_counts():
+    """按学生表重算各班人数（修复历史数据或 Core 批量写入造成的偏差）"""
+    try:
+        fixes = ClassService.reconcile_student_counts()
+        return success_response(fixes, f'已修正 {len(fixes)} 个班级的人数')
+        
+    except Exception as e:
+        return error_response(f'重算班级人数失败: {str(e)}')
+
+@classes_bp.route('/<class_id>/dashboard', methods=['GET'])
+def get_class_dashboard(class_id):
+    """班级成绩看板（按任务汇总，替代前端下载全量成绩表后自行统计）"""
+    try:
+        dashboard = ClassService.get_dashboard(class_id)
+        if dashboard is None:
+            return error_response('班级不存在', 404)
+        
+        return success_response(dashboard)
+        
+    except Exception as e:
+        return error_response(f'获取班级看板失败: {str(e)}')
+
+@classes_bp.route('/dashboard', methods=['GET'])
+def get_class_dashboards():
+    """多个班级的看板汇总（?class_ids=a,b，省略时为全部班级），教师首页一次请求取回"""
+    try:
+        class_ids = request.args.get('class_ids')
+        if class_ids is not None:
+            class_ids = [class_id for class_id in class_ids.split(',') if class_id]
+        
+        return success_response(ClassService.get_dashboard_summaries(class_ids))
+        
+    except Exception as e:
+        return error_response(f'获取班级看板失败: {str(e)}')
+
+@classes_bp.route('/dashboard/cache/stats', methods=['GET'])
+def get_dashboard_cache_stats():
+    """班级看板缓存命中/淘汰统计"""
+    return success_response(ClassService.dashboard_cache_stats())
\ No newline at end of file
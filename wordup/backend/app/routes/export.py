@@ -0,0 +1,32 @@
+from flask import Blueprint, request, Response, stream_with_context
+from app.services.export_service import ExportService
+from app.utils.helpers import error_response
+
+export_bp = Blueprint('export', __name__)
+
+@export_bp.route('/<string:name>', methods=['GET'])
+def export_data(name):
+    """流式导出单词 / 成绩 / 用户
+
+    name: words | scores | users
+    查询参数: format=csv|ndjson, gzip=1 时边导出边压缩
+    """
+    fmt = request.args.get('format', 'csv')
+    compress = request.args.get('gzip', '0').lower() in ('1', 'true')
+    
+    try:
+        chunks = ExportService.stream_export(name, fmt, compress)
+    except ValueError as e:
+        return error_response(str(e))
+    
+    filename = f'{name}.{fmt}' + ('.gz' if compress else '')
+    if compress:
+        mimetype = 'application/gzip'
+    else:
+        mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    
+    return Response(
+        stream_with_context(chunks),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
@@ -1,6 +1,10 @@
-from flask import Blueprint, request, jsonify
+import json
+from datetime import datetime
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from app.models import Task
-from app.utils.helpers import success_response, error_response
+from app.services.task_service import TaskService
+from app.services.task_publisher import task_publisher
+from app.utils.helpers import success_response, error_response, encode_cursor, decode_cursor
 
 tasks_bp = Blueprint('tasks', __name__)
 
@@ -20,4 +24,128 @@ def get_tasks():
         return success_response(tasks_data)
         
     except Exception as e:
-        return error_response(f'获取任务列表失败: {str(e)}')
\ No newline at end of file
+        return error_response(f'获取任务列表失败: {str(e)}')
+
+@tasks_bp.route('/', methods=['POST'])
+def create_task():
+    """创建任务并布置到班级（class_ids），单词表由 word_ids 或 words（拼写）给出"""
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return error_response('请求体必须是 JSON 对象')
+    
+    try:
+        task = TaskService.create_task(data, max_words=current_app.config.get('TASK_MAX_WORDS', 5000))
+        return success_response(task, '任务创建成功')
+    except ValueError as e:
+        return error_response(str(e))
+    except Exception as e:
+        return error_response(f'创建任务失败: {str(e)}')
+
+@tasks_bp.route('/<int:task_id>', methods=['GET'])
+def get_task(task_id):
+    """获取任务详情（含布置班级与单词数）"""
+    try:
+        task = TaskService.get_task(task_id)
+        if task is None:
+            return error_response('任务不存在', 404)
+        return success_response(task)
+        
+    except Exception as e:
+        return error_response(f'获取任务失败: {str(e)}')
+
+@tasks_bp.route('/<int:task_id>/words', methods=['GET'])
+def get_task_words(task_id):
+    """按布置顺序流式返回任务单词（NDJSON，每行一个单词）"""
+    try:
+        words = TaskService.get_task_words(task_id)
+        if words is None:
+            return error_response('任务不存在', 404)
+    except Exception as e:
+        return error_response(f'获取任务单词失败: {str(e)}')
+    
+    def generate():
+        for word in words:
+            yield json.dumps(word, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@tasks_bp.route('/<int:task_id>/publish', methods=['POST'])
+def publish_task(task_id):
+    """把任务扇出为所布置班级中每个学生的布置记录（后台执行，立即返回）
+
+    重复发布只为尚无记录的学生补发；已有发布在进行中时直接返回当前状态。
+    """
+    try:
+        started = task_publisher.publish(task_id)
+        status = task_publisher.status(task_id)
+        if status is None:
+            return error_response('任务不存在', 404)
+        return success_response(status, '任务发布已开始' if started else '任务发布进行中'), 202
+        
+    except Exception as e:
+        return error_response(f'发布任务失败: {str(e)}')
+
+@tasks_bp.route('/<int:task_id>/publish', methods=['GET'])
+def get_publish_status(task_id):
+    """任务发布状态：status 为 pending/running/done/failed，assigned_count 为已生成的学生记录数"""
+    try:
+        status = task_publisher.status(task_id)
+        if status is None:
+            return error_response('任务不存在', 404)
+        return success_response(status)
+        
+    except Exception as e:
+        return error_response(f'获取发布状态失败: {str(e)}')
+
+def _parse_task_page_args():
+    """解析 limit/after/class_id/student_id 参数"""
+    limit = request.args.get('limit', current_app.config.get('TASKS_PAGE_DEFAULT_LIMIT', 20), type=int)
+    if limit is None or limit <= 0:
+        raise ValueError('limit 必须为正整数')
+    limit = min(limit, current_app.config.get('TASKS_PAGE_MAX_LIMIT', 100))
+    
+    after = None
+    cursor = request.args.get('after')
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != 2 or not isinstance(after[0], str) or not isinstance(after[1], int):
+            raise ValueError('无效的游标')
+        after = (datetime.fromisoformat(after[0]), after[1])
+    
+    return {
+        'limit': limit,
+        'after': after,
+        'class_id': request.args.get('class_id') or None,
+        'student_id': request.args.get('student_id') or None
+    }
+
+def _list_task_window(window):
+    try:
+        args = _parse_task_page_args()
+    except ValueError as e:
+        return error_response(str(e))
+    
+    try:
+        items, next_after = TaskService.list_tasks(window, **args)
+        return success_response({
+            'items': items,
+            'next_cursor': encode_cursor(*next_after) if next_after else None,
+            'has_more': next_after is not None
+        })
+    except Exception as e:
+        return error_response(f'获取任务列表失败: {str(e)}')
+
+@tasks_bp.route('/active', methods=['GET'])
+def get_active_tasks():
+    """进行中的任务，按截止时间升序分页"""
+    return _list_task_window('active')
+
+@tasks_bp.route('/upcoming', methods=['GET'])
+def get_upcoming_tasks():
+    """未开始的任务，按开始时间升序分页"""
+    return _list_task_window('upcoming')
+
+@tasks_bp.route('/past', methods=['GET'])
+def get_past_tasks():
+    """已结束的任务，按截止时间倒序分页"""
+    return _list_task_window('past')
\ No newline at end of file
@@ -1,51 +1,77 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from app.models import Student, Teacher, Admin
-from app.utils.helpers import success_response, error_response
+from app.services.id_allocator import id_allocator
+from app.services.roster_import import iter_roster_csv
+from app.services.user_service import UserService, USER_MODELS
+from app.utils.helpers import success_response, error_response, encode_cursor, decode_cursor
 from app import db
 
 users_bp = Blueprint('users', __name__)
 
+def _parse_user_list_args():
+    """解析 limit/after/sort/role/class_id/q 参数"""
+    limit = request.args.get('limit', current_app.config.get('USERS_PAGE_DEFAULT_LIMIT', 50), type=int)
+    if limit is None or limit <= 0:
+        raise ValueError('limit 必须为正整数')
+    limit = min(limit, current_app.config.get('USERS_PAGE_MAX_LIMIT', 500))
+    
+    after = None
+    cursor = request.args.get('after')
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != 3 or not all(isinstance(value, str) for value in after):
+            raise ValueError('无效的游标')
+    
+    roles = None
+    role_arg = request.args.get('role')
+    if role_arg:
+        roles = [r.strip() for r in role_arg.split(',') if r.strip()]
+        unknown = [r for r in roles if r not in USER_MODELS]
+        if unknown:
+            raise ValueError(f'无效的用户类型: {", ".join(unknown)}')
+    
+    return {
+        'limit': limit,
+        'after': after,
+        'sort': request.args.get('sort', 'user_id'),
+        'roles': roles,
+        'class_id': request.args.get('class_id') or None,
+        'prefix': request.args.get('q', '').strip() or None
+    }
+
 @users_bp.route('/all', methods=['GET'])
 def get_all_users():
-    """获取所有用户（学生、教师、管理员）"""
+    """获取所有用户（学生、教师、管理员）
+
+    携带 limit/after/sort/role/class_id/q 任一参数时按键集分页返回
+    （q 为姓名或账号前缀，首页附带各角色总数），否则保持原有行为返回全部用户。
+    """
+    if any(arg in request.args for arg in ('limit', 'after', 'sort', 'role', 'class_id', 'q')):
+        try:
+            args = _parse_user_list_args()
+        except ValueError as e:
+            return error_response(str(e))
+        
+        try:
+            items, next_after = UserService.list_users(**args)
+            data = {
+                'items': items,
+                'next_cursor': encode_cursor(*next_after) if next_after else None,
+                'has_more': next_after is not None
+            }
+            # 总数只在首页计算，翻页时不重复统计
+            if args['after'] is None:
+                counts = UserService.count_users(args['roles'], args['class_id'], args['prefix'])
+                data['counts'] = counts
+                data['total'] = sum(counts.values())
+            return success_response(data)
+        except ValueError as e:
+            return error_response(str(e))
+        except Exception as e:
+            return error_response(f'获取用户列表失败: {str(e)}')
+    
     try:
-        # 获取所有学生
-        students = Student.query.all()
-        student_list = [{
-            'id': f"student_{s.student_id}",
-            'user_id': s.student_id,
-            'name': s.name,
-            'account': s.account,
-            'role': 'student',
-            'class_id': s.class_id,
-            'type': 'student'
-        } for s in students]
-
-        # 获取所有教师
-        teachers = Teacher.query.all()
-        teacher_list = [{
-            'id': f"teacher_{t.teacher_id}",
-            'user_id': t.teacher_id,
-            'name': t.name,
-            'account': t.account,
-            'role': 'teacher',
-            'type': 'teacher'
-        } for t in teachers]
-
-        # 获取所有管理员
-        admins = Admin.query.all()
-        admin_list = [{
-            'id': f"admin_{a.admin_id}",
-            'user_id': a.admin_id,
-            'name': a.name,
-            'account': a.account,
-            'role': 'admin',
-            'email': a.email,
-            'phone': a.phone,
-            'type': 'admin'
-        } for a in admins]
-
-        all_users = student_list + teacher_list + admin_list
+        all_users, _ = UserService.list_users()
         return success_response(all_users)
 
     except Exception as e:
@@ -83,10 +109,9 @@ def create_user():
         if existing:
             return error_response('账号已存在')
 
-        # 生成用户ID
+        # 生成用户ID：从按块预留的编号中分配，不再排序查询最大编号
+        new_id = id_allocator.allocate(user_type)
         if user_type == 'student':
-            last_student = Student.query.order_by(Student.student_id.desc()).first()
-            new_id = f"student{int(last_student.student_id[6:]) + 1:03d}" if last_student else "student001"
             new_user = Student(
                 student_id=new_id,
                 name=name,
@@ -94,16 +119,12 @@ def create_user():
                 class_id=data.get('class_id')
             )
         elif user_type == 'teacher':
-            last_teacher = Teacher.query.order_by(Teacher.teacher_id.desc()).first()
-            new_id = f"teacher{int(last_teacher.teacher_id[6:]) + 1:03d}" if last_teacher else "teacher001"
             new_user = Teacher(
                 teacher_id=new_id,
                 name=name,
                 account=account
             )
         elif user_type == 'admin':
-            last_admin = Admin.query.order_by(Admin.admin_id.desc()).first()
-            new_id = f"admin{int(last_admin.admin_id[5:]) + 1:03d}" if last_admin else "admin001"
             new_user = Admin(
                 admin_id=new_id,
                 name=name,
@@ -122,6 +143,30 @@ def create_user():
         db.session.rollback()
         return error_response(f'创建用户失败: {str(e)}')
 
+@users_bp.route('/import/students', methods=['POST'])
+def import_students():
+    """批量导入学生名单
+
+    JSON 请求体: {"students": [{"student_id", "name", "account", "password", "class_id"}, ...]}
+    或 Content-Type 为 text/csv 的名单文件（表头同上）；未提供 student_id 时自动生成。
+    """
+    if request.mimetype == 'text/csv':
+        rows = iter_roster_csv(request.stream)
+    else:
+        rows = (request.json or {}).get('students')
+        if not isinstance(rows, list) or not rows:
+            return error_response('缺少 students 列表')
+    
+    try:
+        summary = UserService.import_students(
+            rows,
+            chunk_size=current_app.config.get('ROSTER_IMPORT_CHUNK_SIZE', 500)
+        )
+        return success_response(summary, f"成功导入 {summary['inserted']} 名学生")
+        
+    except Exception as e:
+        return error_response(f'导入学生名单失败: {str(e)}')
+
 @users_bp.route('/<user_type>/<user_id>', methods=['DELETE'])
 def delete_user(user_type, user_id):
     """删除用户"""
@@ -140,6 +185,7 @@ def delete_user(user_type, user_id):
 
         db.session.delete(user)
         db.session.commit()
+        UserService.invalidate_profile(user_type, user_id)
 
         return success_response(None, '用户删除成功')
 
@@ -178,6 +224,7 @@ def update_user(user_type, user_id):
             user.set_password(data['password'])
 
         db.session.commit()
+        UserService.invalidate_profile(user_type, user_id)
 
         return success_response(None, '用户更新成功')
 
@@ -1,44 +1,102 @@
-from flask import Blueprint, request, jsonify
+import json
+from functools import wraps
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context, make_response
 from app.models import Word
-from app.services.word_service import WordService
-from app.utils.helpers import success_response, error_response
+from app.services.word_service import WordService, WORD_FIELDS
+from app.services.word_import import IMPORT_MODES, iter_csv_rows, iter_ndjson_rows
+from app.services.quiz_service import QuizService
+from app.utils.helpers import success_response, error_response, raw_success_response, encode_cursor, decode_cursor, \
+    parse_bool
 
 words_bp = Blueprint('words', __name__)
 
+def catalog_etag(view):
+    """以单词目录版本号作为 ETag
+
+    客户端携带的 If-None-Match 与当前版本一致时直接返回 304，不查询 word 表。
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag = WordService.catalog_version_tag()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    return wrapper
+
+def _parse_page_args():
+    """解析 limit/after/fields 分页参数"""
+    default_limit = current_app.config.get('WORDS_PAGE_DEFAULT_LIMIT', 100)
+    max_limit = current_app.config.get('WORDS_PAGE_MAX_LIMIT', 1000)
+    
+    limit = request.args.get('limit', default_limit, type=int)
+    if limit is None or limit <= 0:
+        raise ValueError('limit 必须为正整数')
+    limit = min(limit, max_limit)
+    
+    after = None
+    cursor = request.args.get('after')
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != 1 or not isinstance(values[0], int):
+            raise ValueError('无效的游标')
+        after = values[0]
+    
+    fields = None
+    fields_arg = request.args.get('fields')
+    if fields_arg:
+        fields = [f.strip() for f in fields_arg.split(',') if f.strip()]
+        unknown = [f for f in fields if f not in WORD_FIELDS]
+        if unknown:
+            raise ValueError(f'不支持的字段: {", ".join(unknown)}')
+    
+    return limit, after, fields
+
 @words_bp.route('/', methods=['GET'])
+@catalog_etag
 def get_words():
-    """获取所有单词"""
-    try:
-        words = WordService.get_all_words()
-        words_data = [{
-            'word_id': word.word_id,
-            'content': word.content,
-            'meaning': word.meaning,
-            'speech': word.speech,
-            'is_wrong': word.is_wrong
-        } for word in words]
+    """获取单词列表
+
+    携带 limit/after/fields 任一参数时按 word_id 键集分页返回，
+    否则保持原有行为返回全部单词。
+    """
+    if any(arg in request.args for arg in ('limit', 'after', 'fields')):
+        try:
+            limit, after, fields = _parse_page_args()
+        except ValueError as e:
+            return error_response(str(e))
         
-        return success_response(words_data)
+        try:
+            items, next_after = WordService.get_words_page(limit, after, fields)
+            return success_response({
+                'items': items,
+                'next_cursor': encode_cursor(next_after) if next_after is not None else None,
+                'has_more': next_after is not None
+            })
+        except Exception as e:
+            return error_response(f'获取单词列表失败: {str(e)}')
+    
+    try:
+        # 全量列表直接返回缓存的序列化快照
+        return raw_success_response(WordService.get_all_words_json())
         
     except Exception as e:
         return error_response(f'获取单词列表失败: {str(e)}')
 
 @words_bp.route('/<int:word_id>', methods=['GET'])
+@catalog_etag
 def get_word(word_id):
     """获取单个单词详情"""
     try:
-        word = WordService.get_word_by_id(word_id)
-        if not word:
+        word_data = WordService.get_word_data(word_id)
+        if not word_data:
             return error_response('单词不存在', 404)
         
-        word_data = {
-            'word_id': word.word_id,
-            'content': word.content,
-            'meaning': word.meaning,
-            'speech': word.speech,
-            'is_wrong': word.is_wrong
-        }
-        
         return success_response(word_data)
         
     except Exception as e:
@@ -66,27 +124,98 @@ def add_word():
         
         return success_response(word_data, '单词添加成功')
         
+    except ValueError as e:
+        return error_response(str(e), 409)
     except Exception as e:
         return error_response(f'添加单词失败: {str(e)}')
 
 @words_bp.route('/batch', methods=['POST'])
 def batch_import():
-    """批量导入单词"""
+    """批量导入单词
+
+    可选参数:
+      chunk_size 每块行数
+      atomic     为 true 时全部成功或全部回滚
+      mode       insert 直接插入 / skip 跳过已存在单词 / merge 更新已存在单词
+    """
     data = request.json
     
     if not data or not data.get('words'):
         return error_response('缺少单词数据')
     
+    chunk_size = data.get('chunk_size') or current_app.config.get('WORD_IMPORT_CHUNK_SIZE', 1000)
+    if not isinstance(chunk_size, int) or chunk_size <= 0:
+        return error_response('chunk_size 必须为正整数')
+    chunk_size = min(chunk_size, current_app.config.get('WORD_IMPORT_MAX_CHUNK_SIZE', 5000))
+    
+    mode = data.get('mode', 'insert')
+    if mode not in IMPORT_MODES:
+        return error_response(f'不支持的导入模式: {mode}')
+    
+    try:
+        atomic = parse_bool(data.get('atomic'))
+    except ValueError as e:
+        return error_response(str(e))
+    
     try:
-        imported_words = WordService.batch_import_words(data['words'])
+        summary = WordService.batch_import_words(
+            data['words'],
+            chunk_size=chunk_size,
+            atomic=atomic,
+            mode=mode
+        )
         
+        message = f'成功导入 {summary["inserted"]} 个单词'
+        if summary['updated']:
+            message += f'，更新 {summary["updated"]} 个单词'
         return success_response({
-            'count': len(imported_words)
-        }, f'成功导入 {len(imported_words)} 个单词')
+            'count': summary['inserted'],
+            **summary
+        }, message)
         
     except Exception as e:
         return error_response(f'批量导入失败: {str(e)}')
 
+@words_bp.route('/import/stream', methods=['POST'])
+def stream_import():
+    """流式导入 CSV / NDJSON 单词表
+
+    请求体直接为文件内容，边读边按块写入，内存占用与文件大小无关。
+    查询参数: format=csv|ndjson（缺省按 Content-Type 判断）, mode, chunk_size, atomic
+    响应为 NDJSON：每写完一块输出一行进度，最后一行带 done=true 的汇总。
+    """
+    content_type = request.mimetype or ''
+    fmt = request.args.get('format') or ('ndjson' if 'ndjson' in content_type else 'csv')
+    if fmt not in ('csv', 'ndjson'):
+        return error_response(f'不支持的文件格式: {fmt}')
+    
+    mode = request.args.get('mode', 'insert')
+    if mode not in IMPORT_MODES:
+        return error_response(f'不支持的导入模式: {mode}')
+    
+    chunk_size = request.args.get('chunk_size', current_app.config.get('WORD_IMPORT_CHUNK_SIZE', 1000), type=int)
+    if chunk_size is None or chunk_size <= 0:
+        return error_response('chunk_size 必须为正整数')
+    chunk_size = min(chunk_size, current_app.config.get('WORD_IMPORT_MAX_CHUNK_SIZE', 5000))
+    try:
+        atomic = parse_bool(request.args.get('atomic'))
+    except ValueError as e:
+        return error_response(str(e))
+    
+    rows = iter_csv_rows(request.stream) if fmt == 'csv' else iter_ndjson_rows(request.stream)
+    
+    def generate():
+        summary = None
+        try:
+            for summary in WordService.iter_import_words(rows, chunk_size=chunk_size, atomic=atomic, mode=mode):
+                yield json.dumps({key: value for key, value in summary.items() if key != 'errors'}) + '\n'
+            yield json.dumps({'done': True, 'success': True, **(summary or {})}, ensure_ascii=False) + '\n'
+        except Exception as e:
+            yield json.dumps({'done': True, 'success': False, 'message': f'流式导入失败: {str(e)}',
+                              **(summary or {})}, ensure_ascii=False) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
 @words_bp.route('/<int:word_id>', methods=['PUT'])
 def update_word(word_id):
     """更新单词"""
@@ -107,6 +236,8 @@ def update_word(word_id):
         
         return success_response(word_data, '单词更新成功')
         
+    except ValueError as e:
+        return error_response(str(e), 409)
     except Exception as e:
         return error_response(f'更新单词失败: {str(e)}')
 
@@ -123,7 +254,78 @@ def delete_word(word_id):
     except Exception as e:
         return error_response(f'删除单词失败: {str(e)}')
 
+def _parse_bulk_target(data):
+    """解析批量操作的目标：ids 列表或 filter 筛选条件（二选一）"""
+    ids = data.get('ids')
+    filters = data.get('filter')
+    if (ids is None) == (filters is None):
+        raise ValueError('必须且只能提供 ids 或 filter 之一')
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+        raise ValueError('ids 必须为整数列表')
+    if filters is not None and (not isinstance(filters, dict) or not filters):
+        raise ValueError('filter 必须为非空对象')
+    if filters is not None and 'content_prefix' in filters:
+        prefix = filters['content_prefix']
+        if not isinstance(prefix, str) or not prefix.strip():
+            raise ValueError('content_prefix 必须为非空字符串')
+    return ids, filters
+
+@words_bp.route('/bulk', methods=['PATCH'])
+def bulk_update_words():
+    """批量修改单词
+
+    请求体: {"ids": [...]} 或 {"filter": {"speech", "is_wrong", "content_prefix"}}，
+    以及 {"set": {"meaning", "speech", "is_wrong"}}
+    """
+    data = request.json or {}
+    
+    try:
+        ids, filters = _parse_bulk_target(data)
+        values = data.get('set')
+        if not isinstance(values, dict) or not values:
+            raise ValueError('缺少 set')
+    except ValueError as e:
+        return error_response(str(e))
+    
+    try:
+        affected = WordService.bulk_update_words(
+            values, ids, filters,
+            chunk_size=current_app.config.get('WORD_BULK_CHUNK_SIZE', 1000)
+        )
+        return success_response({'affected': affected}, f'已修改 {affected} 个单词')
+        
+    except ValueError as e:
+        return error_response(str(e))
+    except Exception as e:
+        return error_response(f'批量修改单词失败: {str(e)}')
+
+@words_bp.route('/bulk', methods=['DELETE'])
+def bulk_delete_words():
+    """批量删除单词
+
+    请求体: {"ids": [...]} 或 {"filter": {"speech", "is_wrong", "content_prefix"}}
+    """
+    data = request.json or {}
+    
+    try:
+        ids, filters = _parse_bulk_target(data)
+    except ValueError as e:
+        return error_response(str(e))
+    
+    try:
+        affected = WordService.bulk_delete_words(
+            ids, filters,
+            chunk_size=current_app.config.get('WORD_BULK_CHUNK_SIZE', 1000)
+        )
+        return success_response({'affected': affected}, f'已删除 {affected} 个单词')
+        
+    except ValueError as e:
+        return error_response(str(e))
+    except Exception as e:
+        return error_response(f'批量删除单词失败: {str(e)}')
+
 @words_bp.route('/search', methods=['GET'])
+@catalog_etag
 def search_words():
     """搜索单词"""
     keyword = request.args.get('q', '')
@@ -131,11 +333,16 @@ def search_words():
     if not keyword:
         return error_response('请输入搜索关键词')
     
+    limit = min(request.args.get('limit', current_app.config.get('SEARCH_RESULT_LIMIT', 50), type=int),
+                current_app.config.get('WORDS_PAGE_MAX_LIMIT', 1000))
+    if limit <= 0:
+        return error_response('limit 必须为正整数')
+    
     try:
-        words = Word.query.filter(
-            Word.content.contains(keyword) | 
-            Word.meaning.contains(keyword)
-        ).all()
+        words = WordService.search_words(
+            keyword, limit,
+            use_index=current_app.config.get('WORD_SEARCH_INDEX_ENABLED', True)
+        )
         
         words_data = [{
             'word_id': word.word_id,
@@ -148,4 +355,118 @@ def search_words():
         return success_response(words_data)
         
     except Exception as e:
-        return error_response(f'搜索失败: {str(e)}')
\ No newline at end of file
+        return error_response(f'搜索失败: {str(e)}')
+
+@words_bp.route('/suggest', methods=['GET'])
+@catalog_etag
+def suggest_words():
+    """单词前缀联想"""
+    prefix = request.args.get('prefix', '')
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    
+    if not prefix.strip():
+        return error_response('请输入前缀')
+    if limit <= 0:
+        return error_response('limit 必须为正整数')
+    
+    try:
+        suggestions = WordService.suggest_words(prefix, limit)
+        return success_response([{
+            'word_id': word_id,
+            'content': content
+        } for word_id, content in suggestions])
+        
+    except Exception as e:
+        return error_response(f'获取联想词失败: {str(e)}')
+
+@words_bp.route('/fuzzy', methods=['GET'])
+@catalog_etag
+def fuzzy_words():
+    """拼写纠错："您是不是要找" """
+    text = request.args.get('q', '')
+    max_distance = request.args.get('max_distance', current_app.config.get('FUZZY_MAX_DISTANCE', 2), type=int)
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    
+    if not text.strip():
+        return error_response('请输入要查询的单词')
+    if max_distance is None or not 0 <= max_distance <= current_app.config.get('FUZZY_MAX_DISTANCE', 2):
+        return error_response(f'max_distance 取值范围为 0~{current_app.config.get("FUZZY_MAX_DISTANCE", 2)}')
+    if limit <= 0:
+        return error_response('limit 必须为正整数')
+    
+    try:
+        matches = WordService.fuzzy_search(text, max_distance, limit)
+        return success_response([{
+            'word_id': word_id,
+            'content': content,
+            'distance': distance
+        } for word_id, content, distance in matches])
+        
+    except Exception as e:
+        return error_response(f'拼写纠错查询失败: {str(e)}')
+
+@words_bp.route('/quiz', methods=['POST'])
+def generate_quiz():
+    """为一组单词生成释义选择题（干扰项按词性从预计算池中抽取）
+
+    请求体: {"word_ids": [...], "option_count": 4, "seed": 可选}
+    """
+    data = request.json or {}
+    word_ids = data.get('word_ids')
+    option_count = data.get('option_count', 4)
+    
+    if not isinstance(word_ids, list) or not word_ids:
+        return error_response('缺少 word_ids')
+    if len(word_ids) > 200:
+        return error_response('单次最多生成 200 道题')
+    if not all(isinstance(word_id, int) for word_id in word_ids):
+        return error_response('word_ids 必须为整数列表')
+    if not isinstance(option_count, int) or not 2 <= option_count <= 8:
+        return error_response('option_count 取值范围为 2~8')
+    
+    try:
+        questions = QuizService.generate_quiz(word_ids, option_count, data.get('seed'))
+        return success_response(questions)
+        
+    except Exception as e:
+        return error_response(f'生成测验失败: {str(e)}')
+
+@words_bp.route('/sample', methods=['GET'])
+def sample_words():
+    """随机抽取单词用于背诵
+
+    参数: n（默认 20）、speech（按词性过滤）、exclude（逗号分隔的已掌握 word_id）、seed（可复现）
+    """
+    n = request.args.get('n', 20, type=int)
+    speech = request.args.get('speech') or None
+    seed = request.args.get('seed')
+    
+    if n is None or not 1 <= n <= 200:
+        return error_response('n 取值范围为 1~200')
+    try:
+        exclude = [int(x) for x in request.args.get('exclude', '').split(',') if x.strip()]
+    except ValueError:
+        return error_response('exclude 必须为逗号分隔的整数')
+    
+    try:
+        return success_response(QuizService.sample_words(n, speech, exclude, seed))
+        
+    except Exception as e:
+        return error_response(f'随机抽词失败: {str(e)}')
+
+@words_bp.route('/index/stats', methods=['GET'])
+def index_stats():
+    """内存索引统计（用于评估 worker 内存占用）"""
+    try:
+        return success_response(WordService.index_stats())
+    except Exception as e:
+        return error_response(f'获取索引统计失败: {str(e)}')
+
+
+@words_bp.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """单词读缓存统计（命中 / 未命中 / 淘汰）"""
+    try:
+        return success_response(WordService.cache_stats())
+    except Exception as e:
+        return error_response(f'获取缓存统计失败: {str(e)}')
\ No newline at end of file
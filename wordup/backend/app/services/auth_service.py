@@ -1,18 +1,44 @@
 from app.models import Student, Teacher, Admin  # 添加 Admin 导入
 from app.utils.helpers import error_response
+from app.services.id_allocator import id_allocator
+from app import db
+
+def _verify_password(user, password):
+    """校验密码；成功且哈希参数与当前配置不一致时顺带升级哈希"""
+    if not user or not user.check_password(password):
+        return False
+    if user.password_needs_rehash():
+        user.set_password(password)
+        try:
+            db.session.commit()
+        except Exception:
+            # 升级失败不影响本次登录，下次登录再试
+            db.session.rollback()
+    return True
+
+def _resolve_user_id(kind, model, user_id, label):
+    """注册时确定用户编号：未指定时由 id_allocator 分配，指定时校验并登记，返回 (编号, 错误信息)"""
+    if not user_id:
+        return id_allocator.allocate(kind), None
+    if db.session.get(model, user_id):
+        return None, f"{label}已存在"
+    # 计数以下的编号可能已在其他 worker 预留的块中，之后会被自动分配出去
+    if id_allocator.claim(kind, user_id):
+        return None, f"{label} {user_id} 位于系统自动分配的范围内，请留空由系统分配"
+    return user_id, None
 
 class AuthService:
     @staticmethod
     def authenticate_student(account, password):
         student = Student.query.filter_by(account=account).first()
-        if student and student.check_password(password):
+        if _verify_password(student, password):
             return student
         return None
     
     @staticmethod
     def authenticate_teacher(account, password):
         teacher = Teacher.query.filter_by(account=account).first()
-        if teacher and teacher.check_password(password):
+        if _verify_password(teacher, password):
             return teacher
         return None
     
@@ -21,9 +47,12 @@ class AuthService:
         # 检查账号是否已存在
         if Student.query.filter_by(account=student_data['account']).first():
             return None, "账号已存在"
+        student_id, error_msg = _resolve_user_id('student', Student, student_data.get('student_id'), "学号")
+        if error_msg:
+            return None, error_msg
         
         student = Student(
-            student_id=student_data['student_id'],
+            student_id=student_id,
             name=student_data['name'],
             account=student_data['account'],
             class_id=student_data.get('class_id')
@@ -37,9 +66,12 @@ class AuthService:
         # 检查账号是否已存在
         if Teacher.query.filter_by(account=teacher_data['account']).first():
             return None, "账号已存在"
+        teacher_id, error_msg = _resolve_user_id('teacher', Teacher, teacher_data.get('teacher_id'), "工号")
+        if error_msg:
+            return None, error_msg
         
         teacher = Teacher(
-            teacher_id=teacher_data['teacher_id'],
+            teacher_id=teacher_id,
             name=teacher_data['name'],
             account=teacher_data['account']
         )
@@ -49,7 +81,7 @@ class AuthService:
     @staticmethod
     def authenticate_admin(account, password):
         admin = Admin.query.filter_by(account=account).first()
-        if admin and admin.check_password(password):
+        if _verify_password(admin, password):
             return admin
         return None
     
@@ -58,9 +90,12 @@ class AuthService:
         # 检查账号是否已存在
         if Admin.query.filter_by(account=admin_data['account']).first():
             return None, "管理员账号已存在"
+        admin_id, error_msg = _resolve_user_id('admin', Admin, admin_data.get('admin_id'), "管理员编号")
+        if error_msg:
+            return None, error_msg
         
         admin = Admin(
-            admin_id=admin_data['admin_id'],
+            admin_id=admin_id,
             name=admin_data['name'],
             account=admin_data['account'],
             email=admin_data.get('email'),
@@ -0,0 +1,42 @@
+from flask import g, has_app_context
+from sqlalchemy.exc import IntegrityError
+from app.models import CatalogVersion
+from app import db
+
+class CatalogService:
+    """数据目录版本号
+
+    版本号保存在数据库中，多个 worker 共享同一计数；
+    写操作在自身事务内调用 bump()，读接口用 get_version() 生成 ETag。
+    """
+
+    @staticmethod
+    def get_version(name):
+        """读取版本号；同一请求内只查询一次（ETag 与缓存校验共用）"""
+        memo = g.setdefault('_catalog_versions', {}) if has_app_context() else {}
+        if name not in memo:
+            version = db.session.query(CatalogVersion.version).filter_by(name=name).scalar()
+            memo[name] = version or 0
+        return memo[name]
+
+    @staticmethod
+    def bump(name):
+        """版本号加一（不提交，随调用方事务一起提交），返回新版本号"""
+        if has_app_context():
+            g.setdefault('_catalog_versions', {}).pop(name, None)
+        updated = db.session.query(CatalogVersion).filter_by(name=name) \
+            .update({CatalogVersion.version: CatalogVersion.version + 1}, synchronize_session=False)
+        if not updated:
+            try:
+                with db.session.begin_nested():
+                    db.session.add(CatalogVersion(name=name, version=1))
+            except IntegrityError:
+                # 并发首次写入时另一个事务已插入该行
+                db.session.query(CatalogVersion).filter_by(name=name) \
+                    .update({CatalogVersion.version: CatalogVersion.version + 1}, synchronize_session=False)
+        # 行锁在本事务提交前一直持有，读到的就是本次写入的版本号
+        return db.session.query(CatalogVersion.version).filter_by(name=name).scalar()
+
+    @staticmethod
+    def etag(name):
+        return f'{name}-v{CatalogService.get_version(name)}'
@@ -0,0 +1,247 @@
+from sqlalchemy import select, func, bindparam, or_, event, inspect
+from sqlalchemy.orm import Session
+from app.models import Class, Student, Score, Task
+from app import db
+from app.utils.cache import LRUCache, invalidation_bus
+
+# 班级看板缓存的失效主题，key 为 class_id
+CLASS_DASHBOARD_TOPIC = 'class_dashboard'
+
+def _to_float(value):
+    return round(float(value), 2) if value is not None else None
+
+def _summarize(tasks):
+    """按任务统计汇总出班级看板的 summary（各任务提交率、平均分的平均值）"""
+    return {
+        'task_count': len(tasks),
+        'submission_rate': round(sum(t['submission_rate'] for t in tasks) / len(tasks), 4) if tasks else 0.0,
+        'average': _to_float(sum(t['average'] for t in tasks) / len(tasks)) if tasks else None
+    }
+
+class ClassDashboardCache:
+    """class_id -> 班级看板 的 TTL + LRU 缓存
+
+    成绩或学生（转班、改名、删除）经 ORM 提交后通过 invalidation_bus 失效对应班级；
+    Core 批量写入不触发失效，由 TTL 兜底。
+    """
+
+    def __init__(self, max_size=1000, ttl=300):
+        self.dashboards = LRUCache(max_size, ttl)
+        self.enabled = True
+        self.lowest_count = 5
+        invalidation_bus.subscribe(CLASS_DASHBOARD_TOPIC, self.invalidate)
+
+    def configure(self, config):
+        self.enabled = config.get('CLASS_DASHBOARD_CACHE_ENABLED', True)
+        self.dashboards.max_size = config.get('CLASS_DASHBOARD_CACHE_SIZE', 1000)
+        self.dashboards.ttl = config.get('CLASS_DASHBOARD_CACHE_TTL', 300)
+        self.lowest_count = config.get('CLASS_DASHBOARD_LOWEST_COUNT', 5)
+        self.dashboards.clear()
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.dashboards.clear()
+        else:
+            self.dashboards.delete(key)
+
+    def stats(self):
+        return {'enabled': self.enabled, 'ttl': self.dashboards.ttl, **self.dashboards.stats()}
+
+# 进程级单例
+class_dashboard_cache = ClassDashboardCache()
+
+def _changed_values(obj, attr):
+    """对象某属性的当前值与修改前的值"""
+    history = inspect(obj).attrs[attr].history
+    return {getattr(obj, attr), *history.deleted} - {None}
+
+@event.listens_for(Session, 'before_flush')
+def _collect_dashboard_classes(session, flush_context, instances):
+    """flush 前记下成绩或学生有变动的班级，提交成功后再发布失效"""
+    classes, student_ids = set(), set()
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Score):
+            student_ids |= _changed_values(obj, 'student_id')
+        elif isinstance(obj, Student):
+            classes |= _changed_values(obj, 'class_id')
+    if student_ids:
+        with session.no_autoflush:
+            classes.update(session.execute(
+                select(Student.class_id).where(Student.student_id.in_(student_ids))
+            ).scalars())
+    classes.discard(None)
+    if classes:
+        session.info.setdefault('dashboard_classes', set()).update(classes)
+
+@event.listens_for(Session, 'after_commit')
+def _publish_dashboard_invalidations(session):
+    for class_id in session.info.pop('dashboard_classes', ()):
+        invalidation_bus.publish(CLASS_DASHBOARD_TOPIC, class_id)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_dashboard_invalidations(session):
+    session.info.pop('dashboard_classes', None)
+
+class ClassService:
+    @staticmethod
+    def get_class_students(class_id):
+        """返回 (班级, 学生列表)；学生一次查询取回，不逐个访问 Class.students 懒加载关系"""
+        cls = db.session.get(Class, class_id)
+        if not cls:
+            return None, []
+        students = db.session.execute(
+            select(Student.student_id, Student.name, Student.account)
+            .where(Student.class_id == class_id).order_by(Student.student_id)
+        ).all()
+        return cls, [{
+            'student_id': s.student_id,
+            'name': s.name,
+            'account': s.account
+        } for s in students]
+
+    @staticmethod
+    def reconcile_student_counts():
+        """用一次分组统计重算所有班级的 student_count，只更新不一致的班级，返回修正列表"""
+        actual = dict(db.session.execute(
+            select(Student.class_id, func.count()).where(Student.class_id.isnot(None)).group_by(Student.class_id)
+        ).all())
+        fixes = [{
+            'class_id': class_id,
+            'old': stored,
+            'new': actual.get(class_id, 0)
+        } for class_id, stored in db.session.execute(select(Class.class_id, Class.student_count))
+            if stored != actual.get(class_id, 0)]
+
+        if fixes:
+            table = Class.__table__
+            db.session.execute(
+                table.update().where(table.c.class_id == bindparam('b_class_id'))
+                .values(student_count=bindparam('b_count')),
+                [{'b_class_id': fix['class_id'], 'b_count': fix['new']} for fix in fixes]
+            )
+        db.session.commit()
+        return fixes
+
+    @staticmethod
+    def get_dashboard(class_id):
+        """班级看板：每个任务的平均分、中位数、最高分、提交率与最低分学生，班级不存在时返回 None
+
+        统计由一条查询完成：score 联结 student 按班级筛选，窗口函数按任务分区算出
+        提交数、平均分、最高分和组内名次，只取回名次靠前的学生与中位数所在的一两行，
+        返回的行数与班级人数无关。
+        """
+        if class_dashboard_cache.enabled:
+            dashboard = class_dashboard_cache.dashboards.get(class_id)
+            if dashboard is not None:
+                return dashboard
+
+        cls = db.session.get(Class, class_id)
+        if not cls:
+            return None
+        lowest = class_dashboard_cache.lowest_count
+        
+        partition = {'partition_by': Score.task_id}
+        ranked = select(
+            Score.task_id, Score.student_id, Student.name, Score.score,
+            func.count().over(**partition).label('submitted'),
+            func.avg(Score.score).over(**partition).label('average'),
+            func.max(Score.score).over(**partition).label('highest'),
+            func.row_number().over(order_by=(Score.score, Score.student_id), **partition).label('position')
+        ).join(Student, Score.student_id == Student.student_id) \
+            .where(Student.class_id == class_id, Score.score.isnot(None)).subquery()
+        # 中位数所在名次：n 为奇数时是 (n+1)/2，偶数时是 n/2 与 n/2+1
+        median_rank = (ranked.c.position * 2 >= ranked.c.submitted) & \
+            (ranked.c.position * 2 <= ranked.c.submitted + 2)
+        rows = db.session.execute(
+            select(ranked, Task.task_name).join(Task, Task.task_id == ranked.c.task_id)
+            .where(or_(ranked.c.position <= lowest, median_rank))
+            .order_by(ranked.c.task_id, ranked.c.position)
+        ).all()
+        
+        student_count = cls.student_count or 0
+        tasks = {}
+        for row in rows:
+            task = tasks.get(row.task_id)
+            if task is None:
+                task = tasks[row.task_id] = {
+                    'task_id': row.task_id,
+                    'task_name': row.task_name,
+                    'submitted': row.submitted,
+                    'submission_rate': round(row.submitted / student_count, 4) if student_count else 0.0,
+                    'average': _to_float(row.average),
+                    'median': None,
+                    'max': _to_float(row.highest),
+                    'lowest': [],
+                    '_median': []
+                }
+            if row.position <= lowest:
+                task['lowest'].append({'student_id': row.student_id, 'name': row.name, 'score': _to_float(row.score)})
+            if row.position * 2 >= row.submitted and row.position * 2 <= row.submitted + 2:
+                task['_median'].append(float(row.score))
+        for task in tasks.values():
+            median = task.pop('_median')
+            task['median'] = _to_float(sum(median) / len(median)) if median else None
+        
+        tasks = list(tasks.values())
+        dashboard = {
+            'class_id': cls.class_id,
+            'class_name': cls.class_name,
+            'student_count': student_count,
+            'tasks': tasks,
+            'summary': _summarize(tasks)
+        }
+        if class_dashboard_cache.enabled:
+            class_dashboard_cache.dashboards.set(class_id, dashboard)
+        return dashboard
+
+    @staticmethod
+    def get_dashboard_summaries(class_ids=None):
+        """多个班级（class_ids 为 None 时为全部班级）的看板汇总，供教师首页一次取回
+
+        已缓存完整看板的班级直接取其 summary，其余班级由一条按 (班级, 任务) 分组的查询
+        统计提交数与平均分，请求数与查询数都不随班级数增长。
+        """
+        query = select(Class.class_id, Class.class_name, Class.student_count).order_by(Class.class_id)
+        if class_ids is not None:
+            query = query.where(Class.class_id.in_(class_ids))
+        classes = db.session.execute(query).all()
+        
+        summaries, missing = {}, {}
+        for cls in classes:
+            dashboard = class_dashboard_cache.dashboards.get(cls.class_id) if class_dashboard_cache.enabled else None
+            if dashboard is not None:
+                summaries[cls.class_id] = dashboard['summary']
+            else:
+                missing[cls.class_id] = cls.student_count or 0
+        if missing:
+            tasks = {class_id: [] for class_id in missing}
+            rows = db.session.execute(
+                select(Student.class_id, func.count().label('submitted'), func.avg(Score.score).label('average'))
+                .join(Student, Score.student_id == Student.student_id)
+                .where(Student.class_id.in_(missing), Score.score.isnot(None))
+                .group_by(Student.class_id, Score.task_id)
+            ).all()
+            for row in rows:
+                student_count = missing[row.class_id]
+                tasks[row.class_id].append({
+                    'submission_rate': round(row.submitted / student_count, 4) if student_count else 0.0,
+                    'average': _to_float(row.average)
+                })
+            for class_id, class_tasks in tasks.items():
+                summaries[class_id] = _summarize(class_tasks)
+        
+        return [{
+            'class_id': cls.class_id,
+            'class_name': cls.class_name,
+            'student_count': cls.student_count or 0,
+            'summary': summaries[cls.class_id]
+        } for cls in classes]
+
+    @staticmethod
+    def invalidate_dashboard(class_id=None):
+        """Core 批量写入成绩后手动失效看板（class_id 为 None 时清空全部）"""
+        invalidation_bus.publish(CLASS_DASHBOARD_TOPIC, class_id)
+
+    @staticmethod
+    def dashboard_cache_stats():
+        return class_dashboard_cache.stats()
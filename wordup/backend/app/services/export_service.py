@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import select, literal, null
+from app.models import Word, Score, Student, Teacher, Admin
+from app import db
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+
+# 服务端游标每次取回的行数
+EXPORT_BATCH_SIZE = 2000
+
+def _plain(value):
+    """把数据库值转换为 JSON/CSV 友好的类型"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _stream_statements(statements, batch_size):
+    """用服务端游标依次执行多条查询，按批产出行元组，数据不会整体驻留内存"""
+    for stmt in statements:
+        result = db.session.execute(
+            stmt.execution_options(stream_results=True, yield_per=batch_size)
+        )
+        for partition in result.partitions():
+            yield partition
+
+def _encode_partitions(partitions, columns, fmt):
+    """把每批行编码为一段 CSV 或 NDJSON 文本"""
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+        for rows in partitions:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([[_plain(v) for v in row] for row in rows])
+            yield buffer.getvalue()
+    else:
+        for rows in partitions:
+            yield ''.join(
+                json.dumps(dict(zip(columns, map(_plain, row))), ensure_ascii=False) + '\n'
+                for row in rows
+            )
+
+def _gzip(chunks):
+    """边生成边压缩（gzip 格式）"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+def _user_statements():
+    """学生、教师、管理员三张表统一为同一组列"""
+    return [
+        select(Student.student_id, Student.name, Student.account, literal('student'),
+               Student.class_id, null(), null()).order_by(Student.student_id),
+        select(Teacher.teacher_id, Teacher.name, Teacher.account, literal('teacher'),
+               null(), null(), null()).order_by(Teacher.teacher_id),
+        select(Admin.admin_id, Admin.name, Admin.account, literal('admin'),
+               null(), Admin.email, Admin.phone).order_by(Admin.admin_id),
+    ]
+
+# 导出类型 -> (列名, 生成查询列表的函数)
+EXPORTS = {
+    'words': (
+        ['word_id', 'content', 'meaning', 'speech', 'is_wrong'],
+        lambda: [select(Word.word_id, Word.content, Word.meaning, Word.speech, Word.is_wrong)
+                 .order_by(Word.word_id)]
+    ),
+    'scores': (
+        ['score_id', 'student_id', 'task_id', 'score', 'comment'],
+        lambda: [select(Score.score_id, Score.student_id, Score.task_id, Score.score, Score.comment)
+                 .order_by(Score.score_id)]
+    ),
+    'users': (
+        ['user_id', 'name', 'account', 'role', 'class_id', 'email', 'phone'],
+        _user_statements
+    ),
+}
+
+class ExportService:
+    @staticmethod
+    def stream_export(name, fmt='csv', compress=False, batch_size=EXPORT_BATCH_SIZE):
+        """返回导出数据的生成器（compress 时产出 gzip 字节，否则产出文本）"""
+        if name not in EXPORTS:
+            raise ValueError(f'不支持的导出类型: {name}')
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f'不支持的导出格式: {fmt}')
+
+        columns, statements = EXPORTS[name]
+        chunks = _encode_partitions(_stream_statements(statements(), batch_size), columns, fmt)
+        return _gzip(chunks) if compress else chunks
@@ -0,0 +1,208 @@
+import sys
+import threading
+from app.models import Word
+from app import db
+from app.utils.helpers import normalize_content
+
+def edit_distance(a, b, max_distance):
+    """受限的 Damerau-Levenshtein 距离（相邻换位计 1），超过 max_distance 时提前返回 max_distance + 1"""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = current[0]
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (previous2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+def _deletes(text, max_distance):
+    """text 删除至多 max_distance 个字符得到的所有变体（含自身）"""
+    results = {text}
+    frontier = {text}
+    for _ in range(max_distance):
+        next_frontier = set()
+        for item in frontier:
+            if len(item) <= 1:
+                continue
+            for i in range(len(item)):
+                variant = item[:i] + item[i + 1:]
+                if variant not in results:
+                    results.add(variant)
+                    next_frontier.add(variant)
+        frontier = next_frontier
+    return results
+
+class WordFuzzyIndex:
+    """SymSpell 风格的删除索引，用于拼写纠错（"您是不是要找"）
+
+    对每个单词前 prefix_length 个字符预先生成删除 max_distance 个字符内的变体，
+    查询时只需生成查询串的删除变体去查表，再对少量候选计算编辑距离，
+    不必与词库中每个单词逐一比较。
+    """
+
+    def __init__(self, max_distance=2, prefix_length=7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None  # 索引对应的单词目录版本号
+        # 删除变体 -> 规范化拼写；多数变体只对应一个单词，直接存字符串，多个时才用 set
+        self._deletes = {}
+        self._entries = {}    # 规范化拼写 -> {word_id: 原始 content}
+
+    @property
+    def built(self):
+        return self._built
+
+    def configure(self, config):
+        """按配置设置最大编辑距离与前缀长度，已构建的索引会被丢弃"""
+        self.max_distance = config.get('FUZZY_MAX_DISTANCE', 2)
+        self.prefix_length = config.get('FUZZY_PREFIX_LENGTH', 7)
+        self.reset()
+
+    def build(self, batch_size=5000):
+        """从数据库全量构建索引"""
+        with self._lock:
+            self._deletes = {}
+            self._entries = {}
+            rows = db.session.query(Word.word_id, Word.content) \
+                .execution_options(yield_per=batch_size)
+            for word_id, content in rows:
+                self._add(word_id, content)
+            self._built = True
+
+    def ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def reset(self):
+        """丢弃索引，下次查询时重新构建"""
+        with self._lock:
+            self._built = False
+            self._version = None
+            self._deletes = {}
+            self._entries = {}
+
+    def sync(self, version):
+        """单词目录版本号与索引不一致（其他 worker 写入过）时丢弃索引，下次查询时按该版本重建"""
+        with self._lock:
+            if version != self._version:
+                self.reset()
+                self._version = version
+
+    def advance(self, version):
+        """本 worker 的写入已增量应用到索引：版本号恰好只差这一次写入时跟进，否则丢弃索引"""
+        with self._lock:
+            if self._version is not None and version == self._version + 1:
+                self._version = version
+            else:
+                self.reset()
+
+    def add(self, word_id, content):
+        with self._lock:
+            if self._built:
+                self._add(word_id, content)
+
+    def remove(self, word_id, content):
+        with self._lock:
+            if not self._built:
+                return
+            key = normalize_content(content)
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.pop(word_id, None)
+            if entry:
+                return
+            del self._entries[key]
+            for variant in _deletes(key[:self.prefix_length], self.max_distance):
+                keys = self._deletes.get(variant)
+                if keys == key:
+                    del self._deletes[variant]
+                elif isinstance(keys, set):
+                    keys.discard(key)
+                    if len(keys) == 1:
+                        self._deletes[variant] = keys.pop()
+
+    def lookup(self, text, max_distance=None, limit=10):
+        """返回 [(word_id, content, distance)]，按编辑距离、长度差排序"""
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+        query = normalize_content(text)
+        if not query:
+            return []
+        self.ensure_built()
+
+        with self._lock:
+            scored = []
+            seen = set()
+            for variant in _deletes(query[:self.prefix_length], max_distance):
+                keys = self._deletes.get(variant)
+                if keys is None:
+                    continue
+                for key in ((keys,) if isinstance(keys, str) else keys):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    distance = edit_distance(query, key, max_distance)
+                    if distance <= max_distance:
+                        scored.append((distance, abs(len(key) - len(query)), key))
+            scored.sort()
+
+            results = []
+            for distance, _, key in scored:
+                for word_id, content in sorted(self._entries[key].items()):
+                    results.append((word_id, content, distance))
+                if len(results) >= limit:
+                    break
+            return results[:limit]
+
+    def stats(self):
+        with self._lock:
+            memory = sys.getsizeof(self._deletes) + sys.getsizeof(self._entries)
+            for variant, keys in self._deletes.items():
+                memory += sys.getsizeof(variant)
+                if isinstance(keys, set):
+                    memory += sys.getsizeof(keys)
+            for entry in self._entries.values():
+                memory += sys.getsizeof(entry)
+            return {
+                'built': self._built,
+                'version': self._version,
+                'words': len(self._entries),
+                'variants': len(self._deletes),
+                'memory_bytes': memory
+            }
+
+    def _add(self, word_id, content):
+        key = normalize_content(content)
+        if not key:
+            return
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = {}
+            for variant in _deletes(key[:self.prefix_length], self.max_distance):
+                keys = self._deletes.get(variant)
+                if keys is None:
+                    self._deletes[variant] = key
+                elif isinstance(keys, set):
+                    keys.add(key)
+                elif keys != key:
+                    self._deletes[variant] = {keys, key}
+        entry[word_id] = content
+
+# 进程级单例
+word_fuzzy_index = WordFuzzyIndex()
@@ -0,0 +1,125 @@
+import re
+import threading
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import IntegrityError
+from app.models import Student, Teacher, Admin, IdCounter
+from app import db
+
+# 用户类型 -> (编号前缀, 主键列)
+ID_KINDS = {
+    'student': ('student', Student.student_id),
+    'teacher': ('teacher', Teacher.teacher_id),
+    'admin': ('admin', Admin.admin_id),
+}
+
+def _number_of(kind, user_id):
+    """'student012' -> 12，不符合 前缀+数字 格式时返回 None"""
+    match = re.fullmatch(re.escape(ID_KINDS[kind][0]) + r'(\d+)', user_id or '')
+    return int(match.group(1)) if match else None
+
+class IdAllocator:
+    """按块预留的用户编号分配器
+
+    编号计数保存在 id_counter 表中，各 worker 每次用一条 UPDATE 预留 block_size 个编号，
+    之后在进程内顺序发放，大多数分配不访问数据库。预留在独立的短事务中提交，
+    行锁保证并发 worker 拿到的块互不重叠。worker 重启时未用完的编号会被跳过（编号可能不连续）。
+    客户端自行指定的编号须经 claim 登记：计数以下的编号可能已在其他 worker 预留的块中，不允许使用。
+    """
+
+    def __init__(self, block_size=20):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._blocks = {}   # 用户类型 -> (下一个编号, 块结束编号)
+        self.reservations = 0
+
+    def configure(self, config):
+        with self._lock:
+            self.block_size = config.get('ID_BLOCK_SIZE', 20)
+            self._blocks = {}
+
+    def allocate(self, kind):
+        return self.allocate_many(kind, 1)[0]
+
+    def allocate_many(self, kind, count):
+        """分配 count 个编号；当前块不够时一次预留 max(block_size, 缺口) 个"""
+        if kind not in ID_KINDS:
+            raise ValueError(f'无效的用户类型: {kind}')
+        with self._lock:
+            start, end = self._blocks.get(kind, (0, 0))
+            numbers = list(range(start, min(end, start + count)))
+            start += len(numbers)
+            if len(numbers) < count:
+                need = count - len(numbers)
+                size = max(self.block_size, need)
+                first = self._reserve(kind, size)
+                numbers.extend(range(first, first + need))
+                start, end = first + need, first + size
+            self._blocks[kind] = (start, end)
+        prefix = ID_KINDS[kind][0]
+        return [f'{prefix}{n:03d}' for n in numbers]
+
+    def claim(self, kind, *user_ids):
+        """登记客户端指定的编号（如注册或名单自带学号），返回不能使用的编号集合
+
+        符合 前缀+数字 格式且小于计数的编号可能已被某个 worker 预留（此后会被发放），一律拒绝；
+        其余编号在锁住计数行的同一事务中把计数推进到其中最大编号之后，以后不会再被分配。
+        不符合格式的编号与分配器无关，直接放行。
+        """
+        numbers = {user_id: n for user_id, n in ((user_id, _number_of(kind, user_id)) for user_id in user_ids)
+                   if n is not None}
+        if not numbers:
+            return set()
+        highest = max(numbers.values())
+        with db.engine.begin() as conn:
+            current = select(IdCounter.next_value).where(IdCounter.name == kind).with_for_update()
+            next_value = conn.execute(current).scalar()
+            if next_value is None:
+                # 计数尚未初始化，说明还没有任何块被预留：直接以这些编号之后为起点初始化
+                try:
+                    with conn.begin_nested():
+                        conn.execute(insert(IdCounter).values(
+                            name=kind, next_value=max(self._seed(conn, kind), highest + 1)))
+                    return set()
+                except IntegrityError:
+                    # 其他 worker 同时完成了初始化
+                    next_value = conn.execute(current).scalar()
+            rejected = {user_id for user_id, n in numbers.items() if n < next_value}
+            if len(rejected) < len(numbers):
+                conn.execute(update(IdCounter).where(IdCounter.name == kind, IdCounter.next_value <= highest)
+                             .values(next_value=highest + 1))
+        return rejected
+
+    def stats(self):
+        with self._lock:
+            return {
+                'block_size': self.block_size,
+                'reservations': self.reservations,
+                'remaining': {kind: end - start for kind, (start, end) in self._blocks.items()}
+            }
+
+    def _reserve(self, kind, size):
+        """预留 size 个编号，返回第一个编号"""
+        self.reservations += 1
+        with db.engine.begin() as conn:
+            bump = update(IdCounter).where(IdCounter.name == kind) \
+                .values(next_value=IdCounter.next_value + size)
+            if not conn.execute(bump).rowcount:
+                # 首次使用：从现有数据中最大的编号之后开始
+                first = self._seed(conn, kind)
+                try:
+                    with conn.begin_nested():
+                        conn.execute(insert(IdCounter).values(name=kind, next_value=first + size))
+                    return first
+                except IntegrityError:
+                    # 其他 worker 同时完成了初始化
+                    conn.execute(bump)
+            return conn.execute(select(IdCounter.next_value).where(IdCounter.name == kind)).scalar() - size
+
+    def _seed(self, conn, kind):
+        prefix, column = ID_KINDS[kind]
+        numbers = (_number_of(kind, user_id) for user_id in
+                   conn.execute(select(column).where(column.like(f'{prefix}%'))).scalars())
+        return max((n for n in numbers if n is not None), default=0) + 1
+
+# 进程级单例
+id_allocator = IdAllocator()
@@ -0,0 +1,186 @@
+import random
+import threading
+from array import array
+from flask import current_app
+from app.models import Word
+from app import db
+from app.services.catalog_service import CatalogService
+from app.services.word_service import WORD_CATALOG
+from app.utils.cache import invalidation_bus
+
+# 每道题额外多抽的候选数，用于剔除与正确答案释义相同的干扰项
+EXTRA_CANDIDATES = 2
+
+def _speech_key(speech):
+    return (speech or '').strip().lower()
+
+def _sample_ids(pool, count, exclude, rng):
+    """从 pool 中无放回地抽取 count 个不在 exclude 中的 word_id，抽中的 id 会加入 exclude
+
+    先做随机下标探测（拒绝采样），池子远大于 count 时几乎不会重试，耗时与词库大小无关；
+    排除项占了池子大半导致探测失败过多时，才退化为一次线性过滤。
+    """
+    picked = []
+    attempts = 0
+    while len(picked) < count and attempts < count * 10 and pool:
+        attempts += 1
+        word_id = pool[rng.randrange(len(pool))]
+        if word_id not in exclude:
+            exclude.add(word_id)
+            picked.append(word_id)
+    if len(picked) < count:
+        remaining = [word_id for word_id in pool if word_id not in exclude]
+        extra = rng.sample(remaining, min(count - len(picked), len(remaining)))
+        exclude.update(extra)
+        picked.extend(extra)
+    return picked
+
+class WordIdPools:
+    """按词性分组的 word_id 池，供测验干扰项与随机抽词使用
+
+    每个词性一个紧凑的 array('q')，随机下标取样为 O(1)。
+    池子按单词目录版本号校验，版本变化（包括其他 worker 的写入）时在后台线程重建，
+    重建完成前继续使用旧池子（抽到已删除的 id 时由调用方按查询结果跳过），
+    导入或批量修改期间版本频繁变化也不会让请求等待全表扫描。只有首次使用时同步构建。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._ready = False
+        self._rebuilding = False
+        self._by_speech = {}
+        self._all = array('q')
+        invalidation_bus.subscribe(WORD_CATALOG, self.invalidate)
+
+    def invalidate(self, word_id=None):
+        self._version = None
+
+    def ensure_fresh(self):
+        version = CatalogService.get_version(WORD_CATALOG)
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            if not self._ready:
+                self._swap(version, *self._scan())
+                return
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        app = current_app._get_current_object()
+        threading.Thread(target=self._rebuild_in_background, args=(app,), daemon=True,
+                         name='word-id-pools').start()
+
+    def _rebuild_in_background(self, app):
+        try:
+            with app.app_context():
+                # 先读版本号再扫描：扫描期间的写入会让下一次校验再触发重建
+                version = CatalogService.get_version(WORD_CATALOG)
+                pools = self._scan()
+                db.session.remove()
+            # 扫描不持锁，只在替换时短暂加锁
+            with self._lock:
+                self._swap(version, *pools)
+        except Exception:
+            app.logger.exception('重建单词 id 池失败')
+        finally:
+            self._rebuilding = False
+
+    def _scan(self):
+        """全表扫描，返回 (按词性分组的池子, 全库池子)"""
+        by_speech = {}
+        all_ids = array('q')
+        rows = db.session.query(Word.word_id, Word.speech).execution_options(yield_per=5000)
+        for word_id, speech in rows:
+            by_speech.setdefault(_speech_key(speech), array('q')).append(word_id)
+            all_ids.append(word_id)
+        return by_speech, all_ids
+
+    def _swap(self, version, by_speech, all_ids):
+        """换上新池子（调用方持有 _lock）"""
+        self._by_speech = by_speech
+        self._all = all_ids
+        self._version = version
+        self._ready = True
+
+    def pool(self, speech=None):
+        """speech 为 None 时返回全库 id 池"""
+        if speech is None:
+            return self._all
+        return self._by_speech.get(_speech_key(speech), array('q'))
+
+# 进程级单例
+word_id_pools = WordIdPools()
+
+class QuizService:
+    @staticmethod
+    def generate_quiz(word_ids, option_count=4, seed=None):
+        """为 word_ids 生成释义选择题，返回题目列表（顺序与 word_ids 一致）"""
+        rng = random.Random(seed)
+        word_id_pools.ensure_fresh()
+
+        words = {w.word_id: w for w in db.session.query(Word.word_id, Word.content, Word.meaning, Word.speech)
+                 .filter(Word.word_id.in_(word_ids))}
+
+        # 先为所有题目抽取干扰项 id，再一次性查询释义
+        candidates = {}
+        for word_id in word_ids:
+            word = words.get(word_id)
+            if word is None:
+                continue
+            # 优先同词性干扰项，不足时从全库补齐
+            count = option_count - 1 + EXTRA_CANDIDATES
+            exclude = {word_id}
+            picked = _sample_ids(word_id_pools.pool(word.speech), count, exclude, rng)
+            if len(picked) < count:
+                picked += _sample_ids(word_id_pools.pool(), count - len(picked), exclude, rng)
+            candidates[word_id] = picked
+        needed = {i for ids in candidates.values() for i in ids} - words.keys()
+        meanings = {w.word_id: w.meaning for w in words.values()}
+        if needed:
+            meanings.update(db.session.query(Word.word_id, Word.meaning).filter(Word.word_id.in_(needed)))
+
+        questions = []
+        for word_id in word_ids:
+            word = words.get(word_id)
+            if word is None:
+                continue
+            options = [word.meaning]
+            for candidate_id in candidates[word_id]:
+                meaning = meanings.get(candidate_id)
+                if meaning and meaning not in options:
+                    options.append(meaning)
+                if len(options) == option_count:
+                    break
+            rng.shuffle(options)
+            questions.append({
+                'word_id': word.word_id,
+                'content': word.content,
+                'speech': word.speech,
+                'options': options,
+                'answer': options.index(word.meaning)
+            })
+        return questions
+    
+    @staticmethod
+    def sample_words(n, speech=None, exclude=(), seed=None):
+        """随机抽取 n 个单词（用于背诵），可按词性过滤并排除已掌握的单词
+
+        在缓存的 id 池上随机探测，不做 ORDER BY RAND() 全表排序；结果顺序即随机顺序。
+        """
+        rng = random.Random(seed)
+        word_id_pools.ensure_fresh()
+        
+        ids = _sample_ids(word_id_pools.pool(speech), n, set(exclude), rng)
+        if not ids:
+            return []
+        words = {w.word_id: w for w in Word.query.filter(Word.word_id.in_(ids))}
+        return [{
+            'word_id': word_id,
+            'content': words[word_id].content,
+            'meaning': words[word_id].meaning,
+            'speech': words[word_id].speech,
+            'is_wrong': words[word_id].is_wrong
+        } for word_id in ids if word_id in words]
\ No newline at end of file
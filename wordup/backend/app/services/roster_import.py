@@ -0,0 +1,142 @@
+import csv
+import io
+from sqlalchemy import select, update, func
+from app.models import Student, Class
+from app import db
+from app.services.id_allocator import id_allocator
+from app.utils.passwords import password_hasher
+
+# 汇总中最多记录的错误条数
+MAX_REPORTED_ERRORS = 20
+
+# IN 查询每批的参数个数
+LOOKUP_BATCH_SIZE = 1000
+
+def iter_roster_csv(stream, encoding='utf-8-sig'):
+    """从二进制流解析名单 CSV，首行为表头（student_id,name,account,password,class_id）"""
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding=encoding, newline='')
+    for row in csv.DictReader(text):
+        yield row
+
+def _existing(column, values):
+    """分批 IN 查询，返回 values 中数据库已存在的值"""
+    values = list(values)
+    found = set()
+    for start in range(0, len(values), LOOKUP_BATCH_SIZE):
+        found.update(db.session.execute(
+            select(column).where(column.in_(values[start:start + LOOKUP_BATCH_SIZE]))
+        ).scalars())
+    return found
+
+class StudentRosterImporter:
+    """学生名单批量导入
+
+    1. 逐行校验必填字段，账号/学号在名单内去重，再各用一次（分批）IN 查询对照数据库，
+       未提供学号的学生由 id_allocator 按块分配；
+    2. 密码在 password_hasher 的批量线程池中并行哈希（线程数有上限，不 fork 子进程）；
+    3. 按 chunk_size 分块多行 INSERT，与班级人数更新在同一事务中提交，失败整体回滚。
+    """
+
+    def __init__(self, chunk_size=500):
+        if chunk_size <= 0:
+            raise ValueError('chunk_size 必须为正整数')
+        self.chunk_size = chunk_size
+        self.summary = {
+            'received': 0,
+            'inserted': 0,
+            'skipped': 0,
+            'errors': []
+        }
+
+    def run(self, rows):
+        rows = self._validate(list(rows))
+        if not rows:
+            return self.summary
+
+        passwords = password_hasher.hash_many([row.pop('password') for row in rows])
+        for row, pwhash in zip(rows, passwords):
+            row['password'] = pwhash
+
+        try:
+            for start in range(0, len(rows), self.chunk_size):
+                db.session.execute(Student.__table__.insert(), rows[start:start + self.chunk_size])
+            self._update_class_counts({row['class_id'] for row in rows if row['class_id']})
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        self.summary['inserted'] = len(rows)
+        return self.summary
+
+    def _validate(self, raw_rows):
+        self.summary['received'] = len(raw_rows)
+        candidates = []
+        accounts, student_ids = set(), set()
+        for index, data in enumerate(raw_rows):
+            if not isinstance(data, dict):
+                self._skip(index, '数据格式错误')
+                continue
+            row = {
+                'student_id': str(data.get('student_id') or '').strip() or None,
+                'name': str(data.get('name') or '').strip(),
+                'account': str(data.get('account') or '').strip(),
+                'password': str(data.get('password') or ''),
+                'class_id': str(data.get('class_id') or '').strip() or None
+            }
+            if not row['name'] or not row['account'] or not row['password']:
+                self._skip(index, '缺少 name、account 或 password')
+            elif (len(row['account']) > Student.account.type.length or len(row['name']) > Student.name.type.length
+                  or len(row['student_id'] or '') > Student.student_id.type.length):
+                self._skip(index, 'student_id、account 或 name 过长')
+            elif row['account'] in accounts:
+                self._skip(index, f"名单内账号重复: {row['account']}")
+            elif row['student_id'] and row['student_id'] in student_ids:
+                self._skip(index, f"名单内学号重复: {row['student_id']}")
+            else:
+                accounts.add(row['account'])
+                if row['student_id']:
+                    student_ids.add(row['student_id'])
+                candidates.append((index, row))
+
+        taken_accounts = _existing(Student.account, accounts)
+        taken_ids = _existing(Student.student_id, student_ids)
+        known_classes = _existing(Class.class_id, {row['class_id'] for _, row in candidates if row['class_id']})
+
+        # 名单自带的学号先向分配器登记，落在已分配范围内的不能使用
+        rejected_ids = id_allocator.claim('student', *(
+            row['student_id'] for _, row in candidates
+            if row['student_id'] and row['student_id'] not in taken_ids and row['account'] not in taken_accounts))
+
+        rows = []
+        for index, row in candidates:
+            if row['account'] in taken_accounts:
+                self._skip(index, f"账号已存在: {row['account']}")
+            elif row['student_id'] in taken_ids:
+                self._skip(index, f"学号已存在: {row['student_id']}")
+            elif row['student_id'] in rejected_ids:
+                self._skip(index, f"学号位于系统自动分配的范围内: {row['student_id']}")
+            elif row['class_id'] and row['class_id'] not in known_classes:
+                self._skip(index, f"班级不存在: {row['class_id']}")
+            else:
+                rows.append(row)
+
+        # 其余学生按块分配学号
+        missing_ids = [row for row in rows if not row['student_id']]
+        for row, student_id in zip(missing_ids, id_allocator.allocate_many('student', len(missing_ids))):
+            row['student_id'] = student_id
+        return rows
+
+    def _update_class_counts(self, class_ids):
+        """导入结束后一次性按实际人数重算涉及班级的 student_count"""
+        if not class_ids:
+            return
+        count = select(func.count()).where(Student.class_id == Class.class_id).scalar_subquery()
+        db.session.execute(
+            update(Class).where(Class.class_id.in_(class_ids)).values(student_count=count)
+            .execution_options(synchronize_session=False)
+        )
+
+    def _skip(self, index, message):
+        self.summary['skipped'] += 1
+        if len(self.summary['errors']) < MAX_REPORTED_ERRORS:
+            self.summary['errors'].append({'index': index, 'error': message})
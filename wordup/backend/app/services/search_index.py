@@ -0,0 +1,185 @@
+import threading
+from app.models import Word
+from app import db
+from app.utils.helpers import normalize_content
+
+# content 使用 1~3 字符 n-gram，meaning（中文释义）使用 1~2 字符 n-gram（即 CJK bigram）
+CONTENT_GRAM_SIZE = 3
+MEANING_GRAM_SIZE = 2
+
+# 排名分组：精确匹配 > 前缀匹配 > 子串匹配 > 释义匹配
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_SUBSTRING = 2
+RANK_MEANING = 3
+
+def _grams(text, max_size):
+    """生成 text 中长度为 1..max_size 的所有 n-gram"""
+    grams = set()
+    for size in range(1, max_size + 1):
+        for i in range(len(text) - size + 1):
+            grams.add(text[i:i + size])
+    return grams
+
+def _query_grams(text, max_size):
+    """查询串只需取最长可用长度的 n-gram 做倒排求交"""
+    size = min(len(text), max_size)
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+class WordSearchIndex:
+    """单词的进程内 n-gram 倒排索引
+
+    首次查询时从数据库懒加载，之后由 WordService 的增删改增量维护；
+    查询前用单词目录版本号校验，其他 worker 的写入会让索引在下次查询时重建。
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None       # 索引对应的单词目录版本号
+        self._docs = {}            # word_id -> (content, meaning)，均为规范化后的文本
+        self._content_postings = {}
+        self._meaning_postings = {}
+
+    @property
+    def built(self):
+        return self._built
+
+    def build(self, batch_size=5000):
+        """从数据库全量构建索引"""
+        with self._lock:
+            self._docs = {}
+            self._content_postings = {}
+            self._meaning_postings = {}
+            rows = db.session.query(Word.word_id, Word.content, Word.meaning) \
+                .execution_options(yield_per=batch_size)
+            for word_id, content, meaning in rows:
+                self._add(word_id, content, meaning)
+            self._built = True
+
+    def ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def reset(self):
+        """丢弃索引，下次查询时重新构建"""
+        with self._lock:
+            self._built = False
+            self._version = None
+            self._docs = {}
+            self._content_postings = {}
+            self._meaning_postings = {}
+
+    def sync(self, version):
+        """单词目录版本号与索引不一致（其他 worker 写入过）时丢弃索引，下次查询时按该版本重建"""
+        with self._lock:
+            if version != self._version:
+                self.reset()
+                self._version = version
+
+    def advance(self, version):
+        """本 worker 的写入已增量应用到索引：版本号恰好只差这一次写入时跟进，否则丢弃索引"""
+        with self._lock:
+            if self._version is not None and version == self._version + 1:
+                self._version = version
+            else:
+                self.reset()
+
+    def add(self, word_id, content, meaning):
+        """新增或更新一个单词；索引尚未构建时忽略，构建时会读到最新数据"""
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(word_id)
+            self._add(word_id, content, meaning)
+
+    def remove(self, word_id):
+        with self._lock:
+            if not self._built:
+                return
+            self._remove(word_id)
+
+    def search(self, keyword, limit=50):
+        """返回按相关度排序的 word_id 列表"""
+        keyword = normalize_content(keyword)
+        if not keyword:
+            return []
+        self.ensure_built()
+
+        with self._lock:
+            scored = []
+            matched = set()
+            for word_id in self._candidates(self._content_postings, keyword, CONTENT_GRAM_SIZE):
+                content = self._docs[word_id][0]
+                if keyword not in content:
+                    continue
+                if content == keyword:
+                    rank = RANK_EXACT
+                elif content.startswith(keyword):
+                    rank = RANK_PREFIX
+                else:
+                    rank = RANK_SUBSTRING
+                scored.append((rank, len(content), word_id))
+                matched.add(word_id)
+
+            for word_id in self._candidates(self._meaning_postings, keyword, MEANING_GRAM_SIZE):
+                if word_id in matched:
+                    continue
+                content, meaning = self._docs[word_id]
+                if keyword in meaning:
+                    scored.append((RANK_MEANING, len(content), word_id))
+
+        scored.sort()
+        return [word_id for _, _, word_id in scored[:limit]]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'built': self._built,
+                'version': self._version,
+                'words': len(self._docs),
+                'content_grams': len(self._content_postings),
+                'meaning_grams': len(self._meaning_postings)
+            }
+
+    def _candidates(self, postings, keyword, max_size):
+        """对查询 n-gram 的倒排列表求交，得到候选集合"""
+        lists = []
+        for gram in _query_grams(keyword, max_size):
+            posting = postings.get(gram)
+            if not posting:
+                return set()
+            lists.append(posting)
+        lists.sort(key=len)
+        result = set(lists[0])
+        for posting in lists[1:]:
+            result &= posting
+            if not result:
+                break
+        return result
+
+    def _add(self, word_id, content, meaning):
+        content = normalize_content(content)
+        meaning = normalize_content(meaning)
+        self._docs[word_id] = (content, meaning)
+        for gram in _grams(content, CONTENT_GRAM_SIZE):
+            self._content_postings.setdefault(gram, set()).add(word_id)
+        for gram in _grams(meaning, MEANING_GRAM_SIZE):
+            self._meaning_postings.setdefault(gram, set()).add(word_id)
+
+    def _remove(self, word_id):
+        doc = self._docs.pop(word_id, None)
+        if doc is None:
+            return
+        content, meaning = doc
+        for postings, text, size in ((self._content_postings, content, CONTENT_GRAM_SIZE),
+                                     (self._meaning_postings, meaning, MEANING_GRAM_SIZE)):
+            for gram in _grams(text, size):
+                posting = postings.get(gram)
+                if posting is not None:
+                    posting.discard(word_id)
+                    if not posting:
+                        del postings[gram]
+
+# 进程级单例
+word_search_index = WordSearchIndex()
@@ -0,0 +1,150 @@
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from app.models import Word
+from app import db
+from app.utils.helpers import normalize_content
+
+class WordSuggestIndex:
+    """单词前缀联想索引
+
+    按规范化 content 排序的紧凑数组，前缀查询为一次二分查找加顺序扫描。
+    三个平行数组代替元组列表以节省内存：
+      _keys     规范化后的 content（有序）
+      _contents 原始 content，与 key 相同时复用同一个字符串对象
+      _ids      word_id（array('q')）
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._built = False
+        self._version = None   # 索引对应的单词目录版本号
+        self._keys = []
+        self._contents = []
+        self._ids = array('q')
+
+    @property
+    def built(self):
+        return self._built
+
+    def build(self, batch_size=5000):
+        """从数据库全量构建索引"""
+        with self._lock:
+            rows = db.session.query(Word.word_id, Word.content) \
+                .execution_options(yield_per=batch_size)
+            entries = sorted((self._entry(word_id, content) for word_id, content in rows),
+                             key=lambda e: (e[0], e[2]))
+            self._keys = [e[0] for e in entries]
+            self._contents = [e[1] for e in entries]
+            self._ids = array('q', (e[2] for e in entries))
+            self._built = True
+
+    def ensure_built(self):
+        if not self._built:
+            self.build()
+
+    def reset(self):
+        """丢弃索引，下次查询时重新构建"""
+        with self._lock:
+            self._built = False
+            self._version = None
+            self._keys = []
+            self._contents = []
+            self._ids = array('q')
+
+    def sync(self, version):
+        """单词目录版本号与索引不一致（其他 worker 写入过）时丢弃索引，下次查询时按该版本重建"""
+        with self._lock:
+            if version != self._version:
+                self.reset()
+                self._version = version
+
+    def advance(self, version):
+        """本 worker 的写入已增量应用到索引：版本号恰好只差这一次写入时跟进，否则丢弃索引"""
+        with self._lock:
+            if self._version is not None and version == self._version + 1:
+                self._version = version
+            else:
+                self.reset()
+
+    def add(self, word_id, content):
+        """插入一个单词；索引尚未构建时忽略"""
+        with self._lock:
+            if not self._built:
+                return
+            key, content, word_id = self._entry(word_id, content)
+            pos = self._position(key, word_id)
+            self._keys.insert(pos, key)
+            self._contents.insert(pos, content)
+            self._ids.insert(pos, word_id)
+
+    def remove(self, word_id, content):
+        """按原 content 删除一个单词"""
+        with self._lock:
+            if not self._built:
+                return
+            key = normalize_content(content)
+            pos = self._position(key, word_id)
+            if pos < len(self._keys) and self._keys[pos] == key and self._ids[pos] == word_id:
+                del self._keys[pos]
+                del self._contents[pos]
+                del self._ids[pos]
+
+    def suggest(self, prefix, limit=10):
+        """返回以 prefix 开头的单词 [(word_id, content)]，相同拼写只返回一次"""
+        prefix = normalize_content(prefix)
+        if not prefix:
+            return []
+        self.ensure_built()
+
+        with self._lock:
+            results = []
+            last_key = None
+            keys = self._keys
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and len(results) < limit:
+                key = keys[i]
+                if not key.startswith(prefix):
+                    break
+                if key != last_key:
+                    results.append((self._ids[i], self._contents[i]))
+                    last_key = key
+                i += 1
+            return results
+
+    def memory_bytes(self):
+        """估算索引占用的内存（字节）"""
+        with self._lock:
+            total = sys.getsizeof(self._keys) + sys.getsizeof(self._contents)
+            total += self._ids.buffer_info()[1] * self._ids.itemsize + sys.getsizeof(array('q'))
+            for key, content in zip(self._keys, self._contents):
+                total += sys.getsizeof(key)
+                if content is not key:
+                    total += sys.getsizeof(content)
+            return total
+
+    def stats(self):
+        with self._lock:
+            return {
+                'built': self._built,
+                'version': self._version,
+                'words': len(self._keys),
+                'memory_bytes': self.memory_bytes()
+            }
+
+    def _entry(self, word_id, content):
+        content = content or ''
+        key = normalize_content(content)
+        # key 与原文相同时复用同一对象
+        return (content if key == content else key), content, word_id
+
+    def _position(self, key, word_id):
+        """(key, word_id) 在有序数组中的位置"""
+        i = bisect_left(self._keys, key)
+        while i < len(self._keys) and self._keys[i] == key and self._ids[i] < word_id:
+            i += 1
+        return i
+
+# 进程级单例
+word_suggest_index = WordSuggestIndex()
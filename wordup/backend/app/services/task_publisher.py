@@ -0,0 +1,136 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, insert, update, exists, func, literal, or_
+from app.models import Task, TaskClass, Student, StudentTask
+from app import db
+
+# 发布状态
+PUBLISH_PENDING = 'pending'
+PUBLISH_RUNNING = 'running'
+PUBLISH_DONE = 'done'
+PUBLISH_FAILED = 'failed'
+
+class _LeaseLost(Exception):
+    """租约过期后发布已被其他执行者接手"""
+
+def _lease_time():
+    # MySQL 的 DATETIME 不保存微秒，取整秒以便写入后按值比较
+    return datetime.now().replace(microsecond=0)
+
+def _set_status(task_id, lease, **values):
+    """仅在仍持有发布权（publish_started_at 未被他人改写）时更新状态"""
+    with db.engine.begin() as conn:
+        updated = conn.execute(update(Task).where(Task.task_id == task_id, Task.publish_started_at == lease)
+                               .values(**values)).rowcount
+    if not updated:
+        raise _LeaseLost()
+
+class TaskPublisher:
+    """把任务扇出为每个学生的布置记录（student_task）
+
+    每个班级执行一条 INSERT ... SELECT，由数据库直接从 student 表生成记录，学生数据不经过应用进程；
+    每个班级单独提交并累加 Task.assigned_count，可通过状态接口查看进度。
+    已有记录的学生会被跳过，重复发布是幂等的（可用于给后来转入的学生补发）。
+    扇出在有界后台线程池中执行，发布请求立即返回；状态保存在 task 表中，任意 worker 都能查询。
+    认领时记下 publish_started_at 并在每个班级完成后刷新，超过 TASK_PUBLISH_LEASE 秒没有刷新的
+    pending/running 发布（如 worker 在执行中被重启）可以重新认领；原执行者之后的写入会因时间戳不符而放弃。
+    """
+
+    def __init__(self, workers=2, lease=600):
+        self._lock = threading.Lock()
+        self._executor = None
+        self.configure({'TASK_PUBLISH_WORKERS': workers, 'TASK_PUBLISH_LEASE': lease})
+
+    def configure(self, config):
+        with self._lock:
+            self.lease = config.get('TASK_PUBLISH_LEASE', 600)
+            self.workers = config.get('TASK_PUBLISH_WORKERS', 2)
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='task-publish') \
+                if self.workers > 0 else None
+
+    def publish(self, task_id):
+        """登记一次发布并交给后台执行；任务不存在或已有未过期的发布在进行中时返回 False"""
+        # 条件 UPDATE 抢占发布权，避免同一任务被并发扇出；租约过期的进行中发布可被重新认领
+        lease = _lease_time()
+        with db.engine.begin() as conn:
+            claimed = conn.execute(
+                update(Task).where(Task.task_id == task_id, or_(
+                    Task.publish_status.is_(None),
+                    Task.publish_status.notin_((PUBLISH_PENDING, PUBLISH_RUNNING)),
+                    Task.publish_started_at.is_(None),
+                    Task.publish_started_at < lease - timedelta(seconds=self.lease)
+                )).values(publish_status=PUBLISH_PENDING, publish_error=None, publish_started_at=lease)
+            ).rowcount
+        if not claimed:
+            return False
+        
+        app = current_app._get_current_object()
+        executor = self._executor
+        if executor is None:
+            self._fan_out(app, task_id, lease)
+        else:
+            executor.submit(self._fan_out, app, task_id, lease)
+        return True
+
+    def _fan_out(self, app, task_id, lease):
+        with app.app_context():
+            try:
+                _set_status(task_id, lease, publish_status=PUBLISH_RUNNING)
+                class_ids = db.session.execute(
+                    select(TaskClass.class_id).where(TaskClass.task_id == task_id)
+                ).scalars().all()
+                db.session.remove()
+                
+                now = datetime.now()
+                for class_id in class_ids:
+                    students = select(
+                        literal(task_id), Student.student_id, literal('not_started'), literal(0), literal(now)
+                    ).where(
+                        Student.class_id == class_id,
+                        ~exists().where(StudentTask.task_id == task_id, StudentTask.student_id == Student.student_id)
+                    )
+                    with db.engine.begin() as conn:
+                        inserted = conn.execute(insert(StudentTask).from_select(
+                            ['task_id', 'student_id', 'status', 'progress', 'assigned_at'], students)).rowcount
+                        # 累加进度的同时续约；发布权已被接手时回滚本班级的写入
+                        renewed = _lease_time()
+                        if not conn.execute(update(Task).where(Task.task_id == task_id, Task.publish_started_at == lease).values(
+                                assigned_count=func.coalesce(Task.assigned_count, 0) + inserted,
+                                publish_started_at=renewed)).rowcount:
+                            raise _LeaseLost()
+                    lease = renewed
+                
+                _set_status(task_id, lease, publish_status=PUBLISH_DONE)
+            except _LeaseLost:
+                app.logger.warning('任务 %s 的发布租约已过期并被重新认领，放弃本次执行', task_id)
+            except Exception as e:
+                app.logger.exception('任务 %s 发布失败', task_id)
+                try:
+                    _set_status(task_id, lease, publish_status=PUBLISH_FAILED, publish_error=str(e)[:255])
+                except _LeaseLost:
+                    pass
+
+    def status(self, task_id):
+        """发布状态，任务不存在时返回 None"""
+        row = db.session.execute(
+            select(Task.publish_status, Task.assigned_count, Task.publish_error, Task.publish_started_at,
+                   select(func.count()).where(TaskClass.task_id == task_id).scalar_subquery().label('class_count'))
+            .where(Task.task_id == task_id)
+        ).first()
+        if row is None:
+            return None
+        return {
+            'task_id': task_id,
+            'status': row.publish_status,
+            'class_count': row.class_count,
+            'assigned_count': row.assigned_count or 0,
+            'error': row.publish_error,
+            'started_at': row.publish_started_at.isoformat() if row.publish_started_at else None
+        }
+
+# 进程级单例
+task_publisher = TaskPublisher()
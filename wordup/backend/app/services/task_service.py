@@ -0,0 +1,191 @@
+from datetime import datetime
+from sqlalchemy import select, or_, and_, exists
+from app.models import Task, TaskClass, Student, Class, Word
+from app import db
+from app.services.word_service import WORD_FIELDS
+from app.services.task_publisher import task_publisher
+from app.utils.helpers import normalize_content, unpack_ids
+
+# IN 查询每批的参数个数
+LOOKUP_BATCH_SIZE = 1000
+
+# 时间窗口 -> (排序列, 是否倒序)；active 按截止时间、upcoming 按开始时间升序，past 按截止时间倒序
+TASK_WINDOWS = {
+    'active': (Task.end_time, False),
+    'upcoming': (Task.start_time, False),
+    'past': (Task.end_time, True),
+}
+
+def task_dict(task):
+    """与 GET /api/tasks/ 返回格式一致的任务"""
+    return {
+        'task_id': task.task_id,
+        'task_name': task.task_name,
+        'description': task.description,
+        'start_time': task.start_time.isoformat() if task.start_time else None,
+        'end_time': task.end_time.isoformat() if task.end_time else None
+    }
+
+def _lookup(key_column, value_column, keys):
+    """分批 IN 查询，返回 {key: value}"""
+    keys = list(keys)
+    found = {}
+    for start in range(0, len(keys), LOOKUP_BATCH_SIZE):
+        found.update(db.session.execute(
+            select(key_column, value_column).where(key_column.in_(keys[start:start + LOOKUP_BATCH_SIZE]))
+        ).all())
+    return found
+
+def _parse_time(value, field):
+    try:
+        return datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} 不是有效的时间')
+
+def _resolve_word_ids(data):
+    """word_ids（单词 ID）或 words（拼写，找不到的跳过）-> (去重后保持顺序的 ID 列表, 未找到的拼写)"""
+    if data.get('word_ids') is not None:
+        try:
+            word_ids = list(dict.fromkeys(int(word_id) for word_id in data['word_ids']))
+        except (TypeError, ValueError):
+            raise ValueError('word_ids 必须是整数列表')
+        unknown = set(word_ids) - set(_lookup(Word.word_id, Word.word_id, word_ids))
+        if unknown:
+            raise ValueError(f'单词不存在: {", ".join(map(str, sorted(unknown)[:20]))}')
+        return word_ids, []
+    
+    spellings = [item.get('word') if isinstance(item, dict) else item for item in data.get('words') or []]
+    keys = list(dict.fromkeys(normalize_content(str(spelling)) for spelling in spellings if spelling))
+    ids_by_key = _lookup(Word.content_key, Word.word_id, keys)
+    return list(dict.fromkeys(ids_by_key[key] for key in keys if key in ids_by_key)), \
+        [key for key in keys if key not in ids_by_key]
+
+def _window_filter(window, now):
+    if window == 'active':
+        # 先按 end_time 取范围（进行中 + 未开始，行数很少），start_time 在同一索引内过滤
+        return and_(Task.end_time >= now, Task.start_time <= now)
+    if window == 'upcoming':
+        return Task.start_time > now
+    return Task.end_time < now
+
+def _keyset(sort_column, descending, after):
+    sort_value, task_id = after
+    if descending:
+        return or_(sort_column < sort_value, and_(sort_column == sort_value, Task.task_id < task_id))
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, Task.task_id > task_id))
+
+class TaskService:
+    @staticmethod
+    def list_tasks(window, limit, after=None, class_id=None, student_id=None, now=None):
+        """按时间窗口（active/upcoming/past）键集分页列出任务
+
+        (start_time, end_time) 与 (end_time, start_time) 两个复合索引分别覆盖按开始、按截止时间的范围扫描，
+        每页只读取 limit + 1 行。class_id/student_id 按 task_class 布置关系筛选（学生取其所在班级）。
+        返回 (任务列表, 下一页游标值或 None)；学生不存在或未分班时返回空列表。
+        """
+        if window not in TASK_WINDOWS:
+            raise ValueError(f'无效的任务时间窗口: {window}')
+        sort_column, descending = TASK_WINDOWS[window]
+        now = now or datetime.now()
+        
+        if student_id is not None:
+            student_class = db.session.execute(
+                select(Student.class_id).where(Student.student_id == student_id)
+            ).scalar()
+            if student_class is None or (class_id is not None and class_id != student_class):
+                return [], None
+            class_id = student_class
+        
+        clauses = [_window_filter(window, now)]
+        if class_id is not None:
+            clauses.append(exists().where(TaskClass.task_id == Task.task_id, TaskClass.class_id == class_id))
+        if after is not None:
+            clauses.append(_keyset(sort_column, descending, after))
+        order = (sort_column.desc(), Task.task_id.desc()) if descending else (sort_column, Task.task_id)
+        
+        tasks = db.session.execute(
+            select(Task).where(*clauses).order_by(*order).limit(limit + 1)
+        ).scalars().all()
+        
+        next_after = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            last = tasks[-1]
+            next_after = (getattr(last, sort_column.key), last.task_id)
+        return [task_dict(task) for task in tasks], next_after
+
+    @staticmethod
+    def create_task(data, max_words=5000):
+        """创建任务并布置到班级，单词表打包保存在任务行中
+
+        data: task_name, description, start_time, end_time（ISO 时间），class_ids，
+        以及 word_ids（单词 ID）或 words（拼写列表，数据库中找不到的拼写跳过并在结果中列出，
+        全部找不到时视为校验失败）。
+        校验失败时抛出 ValueError。
+        """
+        task_name = str(data.get('task_name') or '').strip()
+        if not task_name:
+            raise ValueError('缺少必需字段: task_name')
+        start_time = _parse_time(data.get('start_time'), 'start_time')
+        end_time = _parse_time(data.get('end_time'), 'end_time')
+        if end_time <= start_time:
+            raise ValueError('结束时间必须晚于开始时间')
+        
+        class_ids = list(dict.fromkeys(str(class_id) for class_id in data.get('class_ids') or []))
+        unknown = set(class_ids) - set(_lookup(Class.class_id, Class.class_id, class_ids))
+        if unknown:
+            raise ValueError(f'班级不存在: {", ".join(sorted(unknown))}')
+        
+        word_ids, missing_words = _resolve_word_ids(data)
+        if missing_words and not word_ids:
+            raise ValueError(f'单词均不在词库中: {", ".join(missing_words[:20])}')
+        if len(word_ids) > max_words:
+            raise ValueError(f'单个任务最多包含 {max_words} 个单词')
+        
+        task = Task(task_name=task_name, description=data.get('description'),
+                    start_time=start_time, end_time=end_time)
+        task.set_word_ids(word_ids)
+        try:
+            db.session.add(task)
+            db.session.flush()
+            if class_ids:
+                db.session.execute(TaskClass.__table__.insert(),
+                                   [{'task_id': task.task_id, 'class_id': class_id} for class_id in class_ids])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        # 布置了班级的任务立即在后台扇出为学生布置记录
+        if class_ids:
+            task_publisher.publish(task.task_id)
+        return {**task_dict(task), 'class_ids': class_ids, 'word_count': task.word_count,
+                'missing_words': missing_words, 'publish': task_publisher.status(task.task_id)}
+
+    @staticmethod
+    def get_task(task_id):
+        """任务详情（含布置班级与单词数），不存在时返回 None"""
+        task = db.session.get(Task, task_id)
+        if not task:
+            return None
+        class_ids = db.session.execute(
+            select(TaskClass.class_id).where(TaskClass.task_id == task_id).order_by(TaskClass.class_id)
+        ).scalars().all()
+        return {**task_dict(task), 'class_ids': class_ids, 'word_count': task.word_count or 0}
+
+    @staticmethod
+    def get_task_words(task_id):
+        """按布置顺序返回任务的单词列表，任务不存在时返回 None
+
+        单词表从任务行解包，再用一次 IN 查询取回全部单词；已被删除的单词跳过。
+        """
+        blob = db.session.execute(select(Task.word_ids).where(Task.task_id == task_id)).first()
+        if blob is None:
+            return None
+        word_ids = unpack_ids(blob.word_ids)
+        if not word_ids:
+            return []
+        columns = [getattr(Word, field) for field in WORD_FIELDS]
+        words = {row.word_id: dict(row._mapping) for row in
+                 db.session.execute(select(*columns).where(Word.word_id.in_(word_ids)))}
+        return [words[word_id] for word_id in word_ids if word_id in words]
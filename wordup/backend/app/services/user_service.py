@@ -0,0 +1,206 @@
+from sqlalchemy import select, union_all, literal, null, or_, and_, func
+from app.models import Student, Teacher, Admin
+from app import db
+from app.services.roster_import import StudentRosterImporter
+from app.utils.cache import LRUCache, invalidation_bus
+
+USER_MODELS = {'student': Student, 'teacher': Teacher, 'admin': Admin}
+
+USER_ID_COLUMNS = {'student': Student.student_id, 'teacher': Teacher.teacher_id, 'admin': Admin.admin_id}
+
+# 用户列表允许的排序字段
+USER_LIST_SORTS = ('user_id', 'name', 'account')
+
+# 用户资料缓存的失效主题，key 为 'user_type:user_id'
+USER_PROFILE_TOPIC = 'user_profile'
+
+def profile_dict(user, user_type):
+    """与 /api/auth/me 返回格式一致的用户资料"""
+    if user_type == 'student':
+        return {
+            'user_id': user.student_id,
+            'name': user.name,
+            'account': user.account,
+            'user_type': 'student',
+            'class_id': user.class_id
+        }
+    if user_type == 'teacher':
+        return {
+            'user_id': user.teacher_id,
+            'name': user.name,
+            'account': user.account,
+            'user_type': 'teacher'
+        }
+    return {
+        'user_id': user.admin_id,
+        'name': user.name,
+        'account': user.account,
+        'user_type': 'admin',
+        'email': user.email,
+        'phone': user.phone
+    }
+
+def _user_list_item(row):
+    """与原 /api/users/all 返回格式一致的列表项"""
+    item = {
+        'id': f"{row.role}_{row.user_id}",
+        'user_id': row.user_id,
+        'name': row.name,
+        'account': row.account,
+        'role': row.role,
+        'type': row.role
+    }
+    if row.role == 'student':
+        item['class_id'] = row.class_id
+    elif row.role == 'admin':
+        item['email'] = row.email
+        item['phone'] = row.phone
+    return item
+
+def _branch_filters(role, class_id, prefix):
+    """某一类用户的筛选条件；按班级筛选时教师和管理员整支跳过（返回 None）"""
+    model = USER_MODELS[role]
+    clauses = []
+    if class_id is not None:
+        if role != 'student':
+            return None
+        clauses.append(Student.class_id == class_id)
+    if prefix:
+        clauses.append(or_(model.name.startswith(prefix, autoescape=True),
+                           model.account.startswith(prefix, autoescape=True)))
+    return clauses
+
+def _branch_keyset(role, sort_column, id_column, after):
+    """(排序值, 角色, 用户ID) > after 在单个分支上的等价条件
+
+    角色在分支内是常量，直接在 Python 中比较，剩下的条件可以走 (排序列, 主键) 索引。
+    """
+    sort_value, after_role, after_id = after
+    if role > after_role:
+        return sort_column >= sort_value
+    if role < after_role:
+        return sort_column > sort_value
+    if sort_column is id_column:
+        return id_column > after_id
+    return or_(sort_column > sort_value, and_(sort_column == sort_value, id_column > after_id))
+
+class UserProfileCache:
+    """(user_type, user_id) -> 用户资料 的 TTL + LRU 缓存
+
+    修改/删除用户时通过 invalidation_bus 失效；TTL 兜底其他 worker 的写入
+    （失效通道只是进程内替身时，最多读到 TTL 秒内的旧资料）。
+    """
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.profiles = LRUCache(max_size, ttl)
+        self.enabled = True
+        invalidation_bus.subscribe(USER_PROFILE_TOPIC, self.invalidate)
+
+    def configure(self, config):
+        self.enabled = config.get('USER_PROFILE_CACHE_ENABLED', True)
+        self.profiles.max_size = config.get('USER_PROFILE_CACHE_SIZE', 10000)
+        self.profiles.ttl = config.get('USER_PROFILE_CACHE_TTL', 60)
+        self.profiles.clear()
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.profiles.clear()
+        else:
+            self.profiles.delete(key)
+
+    def stats(self):
+        return {'enabled': self.enabled, 'ttl': self.profiles.ttl, **self.profiles.stats()}
+
+# 进程级单例
+user_profile_cache = UserProfileCache()
+
+class UserService:
+    @staticmethod
+    def get_profile(user_type, user_id):
+        """返回用户资料字典，用户不存在时返回 None（不缓存不存在的用户）"""
+        key = f'{user_type}:{user_id}'
+        if user_profile_cache.enabled:
+            profile = user_profile_cache.profiles.get(key)
+            if profile is not None:
+                return profile
+
+        user = db.session.get(USER_MODELS[user_type], user_id)
+        if not user:
+            return None
+        profile = profile_dict(user, user_type)
+        if user_profile_cache.enabled:
+            user_profile_cache.profiles.set(key, profile)
+        return profile
+
+    @staticmethod
+    def list_users(limit=None, after=None, sort='user_id', roles=None, class_id=None, prefix=None):
+        """学生、教师、管理员合并为一条 UNION ALL 查询，按 (sort, role, user_id) 键集分页
+
+        每个分支先在数据库端按同样的顺序筛选并取 limit + 1 行，外层只需合并少量行，
+        耗时与用户总数无关。返回 (列表项, 下一页游标值或 None)。
+        """
+        if sort not in USER_LIST_SORTS:
+            raise ValueError(f'不支持的排序字段: {sort}')
+        
+        branches = []
+        for role, model in USER_MODELS.items():
+            if roles and role not in roles:
+                continue
+            clauses = _branch_filters(role, class_id, prefix)
+            if clauses is None:
+                continue
+            id_column = USER_ID_COLUMNS[role]
+            sort_column = id_column if sort == 'user_id' else getattr(model, sort)
+            if after is not None:
+                clauses.append(_branch_keyset(role, sort_column, id_column, after))
+            branch = select(
+                id_column.label('user_id'), model.name.label('name'), model.account.label('account'),
+                literal(role).label('role'),
+                (Student.class_id if role == 'student' else null()).label('class_id'),
+                (Admin.email if role == 'admin' else null()).label('email'),
+                (Admin.phone if role == 'admin' else null()).label('phone')
+            ).where(*clauses)
+            if limit is not None:
+                branch = select(branch.order_by(sort_column, id_column).limit(limit + 1).subquery())
+            branches.append(branch)
+        if not branches:
+            return [], None
+        
+        users = union_all(*branches).subquery()
+        query = select(users).order_by(users.c[sort], users.c.role, users.c.user_id)
+        if limit is not None:
+            query = query.limit(limit + 1)
+        rows = db.session.execute(query).all()
+        
+        next_after = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_after = (getattr(last, sort), last.role, last.user_id)
+        return [_user_list_item(row) for row in rows], next_after
+    
+    @staticmethod
+    def count_users(roles=None, class_id=None, prefix=None):
+        """按角色统计满足筛选条件的用户数，三个 COUNT 合并为一次查询"""
+        counts = []
+        for role, model in USER_MODELS.items():
+            clauses = _branch_filters(role, class_id, prefix)
+            if (roles and role not in roles) or clauses is None:
+                counts.append(literal(0).label(role))
+            else:
+                counts.append(select(func.count()).select_from(model).where(*clauses)
+                              .scalar_subquery().label(role))
+        return dict(db.session.execute(select(*counts)).one()._mapping)
+    
+    @staticmethod
+    def import_students(rows, chunk_size=500):
+        """批量导入学生名单，返回 received/inserted/skipped 汇总"""
+        return StudentRosterImporter(chunk_size=chunk_size).run(rows)
+    
+    @staticmethod
+    def invalidate_profile(user_type, user_id):
+        invalidation_bus.publish(USER_PROFILE_TOPIC, f'{user_type}:{user_id}')
+
+    @staticmethod
+    def profile_cache_stats():
+        return user_profile_cache.stats()
@@ -0,0 +1,237 @@
+import csv
+import io
+import json
+from itertools import islice
+from sqlalchemy import func
+from app.models import Word
+from app import db
+from app.utils.helpers import normalize_content, parse_bool
+
+# 汇总中最多记录的错误条数
+MAX_REPORTED_ERRORS = 20
+
+# insert: 直接插入，重复拼写计为失败
+# skip:   按 content_key 去重，已存在的单词跳过
+# merge:  按 content_key 去重，已存在的单词用导入数据更新释义和词性
+IMPORT_MODES = ('insert', 'skip', 'merge')
+
+def _chunks(iterable, size):
+    """将任意可迭代对象切分为固定大小的列表"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def prepare_word_row(word_data):
+    """校验并转换一行导入数据，返回 (row, 错误信息)"""
+    if not isinstance(word_data, dict):
+        return None, '数据格式错误'
+    content = (word_data.get('content') or '').strip()
+    meaning = (word_data.get('meaning') or '').strip()
+    if not content or not meaning:
+        return None, '缺少 content 或 meaning'
+    if len(content) > Word.content.type.length:
+        return None, 'content 过长'
+    speech = word_data.get('speech') or None
+    if speech is not None and len(str(speech)) > Word.speech.type.length:
+        return None, 'speech 过长'
+    try:
+        is_wrong = parse_bool(word_data.get('is_wrong'))
+    except ValueError:
+        return None, '无效的 is_wrong'
+    return {
+        'content': content,
+        'content_key': normalize_content(content),
+        'meaning': meaning,
+        'speech': speech,
+        'is_wrong': is_wrong
+    }, None
+
+def iter_csv_rows(stream, encoding='utf-8-sig'):
+    """从二进制流逐行解析 CSV，首行为表头（content,meaning,speech,is_wrong）"""
+    text = io.TextIOWrapper(io.BufferedReader(stream), encoding=encoding, newline='')
+    for row in csv.DictReader(text):
+        yield row
+
+def iter_ndjson_rows(stream, encoding='utf-8'):
+    """从二进制流逐行解析 NDJSON，无法解析的行产出 None（计为跳过）"""
+    for line in io.BufferedReader(stream):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line.decode(encoding))
+        except ValueError:
+            yield None
+
+def _insert_new_statement():
+    """按数据库方言构造只插入新单词的多行语句：content_key 已存在的行跳过，且不计入写入行数"""
+    table = Word.__table__
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        # SQLAlchemy 连接 MySQL 时总是带 FOUND_ROWS，ON DUPLICATE KEY 的空操作也计为 1 行，
+        # 只有 IGNORE 能让重复行不计入 rowcount；各字段长度已在 prepare_word_row 中校验，不会被截断
+        return table.insert().prefix_with('IGNORE')
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        # 冲突跳过的行不出现在 RETURNING 结果中
+        return insert(table).on_conflict_do_nothing(index_elements=['content_key']).returning(table.c.word_id)
+    raise ValueError(f'数据库 {dialect} 不支持去重导入')
+
+def _merge_statement():
+    """按数据库方言构造基于 content_key 唯一索引的合并写入语句（已存在的单词更新释义和词性）"""
+    table = Word.__table__
+    dialect = db.engine.dialect.name
+    if dialect == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        return stmt.on_duplicate_key_update(
+            meaning=stmt.inserted.meaning,
+            speech=func.coalesce(stmt.inserted.speech, table.c.speech)
+        )
+    if dialect in ('sqlite', 'postgresql'):
+        if dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=['content_key'],
+            set_={
+                'meaning': stmt.excluded.meaning,
+                'speech': func.coalesce(stmt.excluded.speech, table.c.speech)
+            }
+        )
+    raise ValueError(f'数据库 {dialect} 不支持去重导入')
+
+class WordBulkImporter:
+    """基于 Core 多行 INSERT 的单词批量导入
+
+    数据按 chunk_size 分块，每块一条多行语句写入：
+      - 默认每块单独提交，某块失败时逐行重试以定位坏行，其余块不受影响；
+      - atomic=True 时所有块在同一事务中写入，任何错误都会整体回滚并抛出异常；
+      - mode 为 skip/merge 时按 content_key 唯一索引在数据库端去重，新增行数取自写入语句本身
+        （RETURNING 或 rowcount），不预先查询；merge 时块内有已存在的单词才再执行一条合并写入。
+    """
+
+    def __init__(self, chunk_size=1000, atomic=False, mode='insert'):
+        if chunk_size <= 0:
+            raise ValueError('chunk_size 必须为正整数')
+        if mode not in IMPORT_MODES:
+            raise ValueError(f'不支持的导入模式: {mode}')
+        self.chunk_size = chunk_size
+        self.atomic = atomic
+        self.mode = mode
+        self.statement = Word.__table__.insert() if mode == 'insert' else _insert_new_statement()
+        self.merge_statement = _merge_statement() if mode == 'merge' else None
+        self.summary = {
+            'received': 0,
+            'inserted': 0,
+            'updated': 0,
+            'skipped': 0,
+            'failed': 0,
+            'errors': []
+        }
+
+    def run(self, words_data):
+        """导入 words_data（可以是列表或生成器），返回汇总信息"""
+        for _ in self.iter_run(words_data):
+            pass
+        return self.summary
+
+    def iter_run(self, words_data):
+        """逐块导入，每写完一块产出一次当前汇总，用于流式上报进度"""
+        index = 0
+        try:
+            for chunk in _chunks(words_data, self.chunk_size):
+                rows = []
+                for word_data in chunk:
+                    row, error = prepare_word_row(word_data)
+                    if error:
+                        self.summary['skipped'] += 1
+                        self._record_error(index, error)
+                    else:
+                        rows.append((index, row))
+                    index += 1
+                self.summary['received'] = index
+                if rows:
+                    self._write_chunk(rows)
+                yield self.summary
+
+            if self.atomic:
+                db.session.commit()
+        except Exception:
+            db.session.rollback()
+            if self.atomic:
+                self.summary['failed'] = self.summary['received'] - self.summary['skipped']
+                self.summary['inserted'] = 0
+                self.summary['updated'] = 0
+            raise
+
+    def _write_chunk(self, rows):
+        if self.mode != 'insert':
+            rows = self._dedupe_chunk(rows)
+
+        if self.atomic:
+            self._add_counts(self._execute(rows))
+            return
+
+        try:
+            counts = self._execute(rows)
+            db.session.commit()
+            self._add_counts(counts)
+        except Exception:
+            db.session.rollback()
+            # 整块失败时逐行写入，只丢弃真正有问题的行
+            for index, row in rows:
+                try:
+                    counts = self._execute([(index, row)])
+                    db.session.commit()
+                    self._add_counts(counts)
+                except Exception as e:
+                    db.session.rollback()
+                    self.summary['failed'] += 1
+                    self._record_error(index, str(e.__cause__ or e))
+
+    def _execute(self, rows):
+        """执行多行写入语句，返回 (新增, 更新, 跳过) 行数"""
+        params = [row for _, row in rows]
+        result = db.session.execute(self.statement, params)
+        if self.mode == 'insert':
+            return len(rows), 0, 0
+
+        inserted = len(result.all()) if result.returns_rows else result.rowcount
+        existing = len(rows) - inserted
+        if self.mode == 'skip':
+            return inserted, 0, existing
+        if existing:
+            # 本块新增的行再写一次是同值更新，不影响结果
+            db.session.execute(self.merge_statement, params)
+        return inserted, existing, 0
+
+    def _add_counts(self, counts):
+        inserted, updated, skipped = counts
+        self.summary['inserted'] += inserted
+        self.summary['updated'] += updated
+        self.summary['skipped'] += skipped
+
+    def _dedupe_chunk(self, rows):
+        """同一块内的重复拼写只保留一行：skip 保留第一行，merge 保留最后一行"""
+        unique = {}
+        for index, row in rows:
+            key = row['content_key']
+            if key in unique:
+                self.summary['skipped'] += 1
+                if self.mode == 'skip':
+                    continue
+            unique[key] = (index, row)
+        return list(unique.values())
+
+    def _record_error(self, index, message):
+        if len(self.summary['errors']) < MAX_REPORTED_ERRORS:
+            self.summary['errors'].append({'index': index, 'error': message})
@@ -1,17 +1,258 @@
+import json
+from flask import current_app
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
 from app.models import Word, WrongBook
 from app import db
+from app.services.catalog_service import CatalogService
+from app.services.fuzzy_index import word_fuzzy_index
+from app.services.search_index import word_search_index
+from app.services.suggest_index import word_suggest_index
+from app.services.word_import import WordBulkImporter
+from app.utils.cache import LRUCache, invalidation_bus
+from app.utils.helpers import parse_bool
+
+# 允许通过 fields= 投影读取的列
+WORD_FIELDS = ('word_id', 'content', 'meaning', 'speech', 'is_wrong')
+
+# 批量修改允许设置的列（拼写唯一，不支持批量改拼写）
+WORD_BULK_UPDATE_FIELDS = ('meaning', 'speech', 'is_wrong')
+
+# 批量修改/删除支持的筛选条件
+WORD_BULK_FILTERS = ('speech', 'is_wrong', 'content_prefix')
+
+# 单词目录的版本号名称，用于 ETag
+WORD_CATALOG = 'word'
+
+class WordCache:
+    """单词读缓存：单个单词的有界 LRU + 全量列表的序列化快照
+
+    两级失效保证多 worker 下的正确性：
+      - 写操作通过 invalidation_bus 发布失效消息，订阅者立即丢弃对应条目；
+      - 每次读取前用单词目录版本号（数据库中共享）校验，版本变化即整体清空，
+        即使失效通道只是进程内替身，其他 worker 的写入也不会读到旧数据。
+    """
+
+    def __init__(self, max_size=10000):
+        self.words = LRUCache(max_size)
+        self.snapshot = LRUCache(max_size=1)   # version -> 序列化后的全量列表
+        self._version = None
+        invalidation_bus.subscribe(WORD_CATALOG, self.invalidate)
+
+    def configure(self, config):
+        self.words.max_size = config.get('WORD_CACHE_SIZE', 10000)
+
+    @property
+    def enabled(self):
+        return current_app.config.get('WORD_CACHE_ENABLED', True)
+
+    def sync(self, version):
+        """版本号变化时清空缓存"""
+        if version != self._version:
+            self.words.clear()
+            self.snapshot.clear()
+            self._version = version
+
+    def invalidate(self, word_id=None):
+        if word_id is None:
+            self.words.clear()
+        else:
+            self.words.delete(word_id)
+        self.snapshot.clear()
+
+    def stats(self):
+        return {
+            'enabled': self.enabled,
+            'version': self._version,
+            'words': self.words.stats(),
+            'snapshot': self.snapshot.stats()
+        }
+
+# 进程级单例
+word_cache = WordCache()
+
+def _word_dict(word):
+    return {
+        'word_id': word.word_id,
+        'content': word.content,
+        'meaning': word.meaning,
+        'speech': word.speech,
+        'is_wrong': word.is_wrong
+    }
+
+def _index_word(word, version, old_content=None):
+    """单词新增或修改后同步内存索引与缓存，version 为本次写入后的目录版本号"""
+    word_search_index.add(word.word_id, word.content, word.meaning)
+    if old_content is not None:
+        word_suggest_index.remove(word.word_id, old_content)
+    word_suggest_index.add(word.word_id, word.content)
+    if old_content is not None:
+        word_fuzzy_index.remove(word.word_id, old_content)
+    word_fuzzy_index.add(word.word_id, word.content)
+    _advance_indexes(version)
+    invalidation_bus.publish(WORD_CATALOG, word.word_id)
+
+def _advance_indexes(version):
+    for index in (word_search_index, word_suggest_index, word_fuzzy_index):
+        index.advance(version)
+
+def _sync_indexes(*indexes):
+    """查询前用共享的目录版本号校验内存索引，其他 worker 写入过时索引会重建"""
+    version = CatalogService.get_version(WORD_CATALOG)
+    for index in indexes:
+        index.sync(version)
+
+def _after_bulk_write():
+    """批量写入后提升目录版本，并丢弃内存索引（下次查询时重建）与缓存"""
+    CatalogService.bump(WORD_CATALOG)
+    db.session.commit()
+    word_search_index.reset()
+    word_suggest_index.reset()
+    word_fuzzy_index.reset()
+    invalidation_bus.publish(WORD_CATALOG)
+
+def _unindex_word(word_id, content, version):
+    """单词删除后同步内存索引与缓存"""
+    word_search_index.remove(word_id)
+    word_suggest_index.remove(word_id, content)
+    word_fuzzy_index.remove(word_id, content)
+    _advance_indexes(version)
+    invalidation_bus.publish(WORD_CATALOG, word_id)
+
+def _bulk_filter_clauses(filters):
+    """把筛选条件字典转换为 WHERE 子句列表"""
+    unknown = [key for key in filters if key not in WORD_BULK_FILTERS]
+    if unknown:
+        raise ValueError(f'不支持的筛选条件: {", ".join(unknown)}')
+    clauses = []
+    if 'speech' in filters:
+        clauses.append(Word.speech == filters['speech'])
+    if 'is_wrong' in filters:
+        clauses.append(Word.is_wrong == parse_bool(filters['is_wrong']))
+    if 'content_prefix' in filters:
+        prefix = filters['content_prefix']
+        # 空白前缀会匹配全部单词，必须拒绝
+        if not isinstance(prefix, str) or not prefix.strip():
+            raise ValueError('content_prefix 必须为非空字符串')
+        clauses.append(Word.content_key.startswith(prefix.strip().lower(), autoescape=True))
+    return clauses
+
+def _iter_bulk_id_chunks(ids, clauses, chunk_size):
+    """按块产出待处理的 word_id
+
+    给定 ids 时直接分块；否则按筛选子句以 word_id 键集分页取出匹配的 id，
+    每块单独一个事务，避免一条语句长时间锁住大片行。
+    """
+    if ids is not None:
+        ids = sorted(set(ids))
+        for start in range(0, len(ids), chunk_size):
+            yield ids[start:start + chunk_size]
+        return
+    
+    last_id = 0
+    while True:
+        chunk = db.session.execute(
+            select(Word.word_id).where(Word.word_id > last_id, *clauses)
+            .order_by(Word.word_id).limit(chunk_size)
+        ).scalars().all()
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1]
+
+def _run_bulk(statement_for_chunk, ids, filters, chunk_size):
+    """逐块执行集合式 UPDATE/DELETE 并提交，返回受影响行数
+
+    中途失败时已提交的块保留，同样提升目录版本并重建索引。
+    """
+    clauses = None
+    if ids is None:
+        # 不产生任何 WHERE 子句的筛选条件等于选中全表，一律拒绝
+        clauses = _bulk_filter_clauses(filters or {})
+        if not clauses:
+            raise ValueError('必须提供 ids 或有效的筛选条件')
+    affected = 0
+    try:
+        for chunk in _iter_bulk_id_chunks(ids, clauses, chunk_size):
+            result = db.session.execute(
+                statement_for_chunk(chunk).execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            affected += result.rowcount
+    except Exception:
+        db.session.rollback()
+        raise
+    finally:
+        if affected:
+            _after_bulk_write()
+    return affected
 
 class WordService:
     @staticmethod
     def get_all_words():
         return Word.query.all()
     
+    @staticmethod
+    def get_words_page(limit, after=None, fields=None):
+        """按 word_id 键集分页，只读取所需的列
+        
+        返回 (行字典列表, 下一页的起始 word_id 或 None)
+        """
+        fields = [f for f in WORD_FIELDS if f in fields] if fields else list(WORD_FIELDS)
+        if 'word_id' not in fields:
+            fields.insert(0, 'word_id')
+        
+        query = db.session.query(*[getattr(Word, f) for f in fields])
+        if after is not None:
+            query = query.filter(Word.word_id > after)
+        # 多取一行用于判断是否还有下一页
+        rows = query.order_by(Word.word_id).limit(limit + 1).all()
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        items = [dict(zip(fields, row)) for row in rows]
+        next_after = items[-1]['word_id'] if has_more else None
+        return items, next_after
+    
+    @staticmethod
+    def get_all_words_json():
+        """全量单词列表的 JSON 序列化结果（bytes），命中缓存时不查询数据库"""
+        if not word_cache.enabled:
+            return json.dumps([_word_dict(w) for w in Word.query.all()], ensure_ascii=False).encode('utf-8')
+        
+        version = CatalogService.get_version(WORD_CATALOG)
+        word_cache.sync(version)
+        payload = word_cache.snapshot.get(version)
+        if payload is None:
+            rows = db.session.query(*[getattr(Word, f) for f in WORD_FIELDS]).order_by(Word.word_id).all()
+            payload = json.dumps([dict(zip(WORD_FIELDS, row)) for row in rows], ensure_ascii=False).encode('utf-8')
+            word_cache.snapshot.set(version, payload)
+        return payload
+    
     @staticmethod
     def get_word_by_id(word_id):
         return Word.query.get(word_id)
     
+    @staticmethod
+    def get_word_data(word_id):
+        """读取单个单词（dict），经过 LRU 缓存"""
+        if word_cache.enabled:
+            word_cache.sync(CatalogService.get_version(WORD_CATALOG))
+            data = word_cache.words.get(word_id)
+            if data is not None:
+                return data
+        
+        word = Word.query.get(word_id)
+        if not word:
+            return None
+        data = _word_dict(word)
+        if word_cache.enabled:
+            word_cache.words.set(word_id, data)
+        return data
+    
     @staticmethod
     def add_word(word_data):
+        """添加单词，拼写（忽略大小写）已存在时抛出 ValueError"""
         word = Word(
             content=word_data['content'],
             meaning=word_data['meaning'],
@@ -19,24 +260,41 @@ class WordService:
             is_wrong=word_data.get('is_wrong', False)
         )
         db.session.add(word)
-        db.session.commit()
+        try:
+            # 先 flush 让拼写重复在这里抛出，bump 的查询不会再触发 autoflush
+            db.session.flush()
+            version = CatalogService.bump(WORD_CATALOG)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError('单词已存在')
+        _index_word(word, version)
         return word
     
     @staticmethod
-    def batch_import_words(words_data):
-        imported_words = []
-        for word_data in words_data:
-            word = Word(
-                content=word_data['content'],
-                meaning=word_data['meaning'],
-                speech=word_data.get('speech'),
-                is_wrong=word_data.get('is_wrong', False)
-            )
-            db.session.add(word)
-            imported_words.append(word)
+    def batch_import_words(words_data, chunk_size=1000, atomic=False, mode='insert'):
+        """分块批量导入单词，返回 inserted/updated/skipped/failed 汇总
         
-        db.session.commit()
-        return imported_words
+        mode: insert 直接插入；skip 跳过已存在的拼写；merge 更新已存在单词的释义
+        """
+        importer = WordBulkImporter(chunk_size=chunk_size, atomic=atomic, mode=mode)
+        try:
+            return importer.run(words_data)
+        finally:
+            # Core 批量插入拿不到逐行 word_id，有写入时让内存索引下次查询时重建
+            if importer.summary['inserted'] or importer.summary['updated']:
+                _after_bulk_write()
+    
+    @staticmethod
+    def iter_import_words(words_data, chunk_size=1000, atomic=False, mode='insert'):
+        """与 batch_import_words 相同，但每写完一块产出一次汇总（用于流式导入）"""
+        importer = WordBulkImporter(chunk_size=chunk_size, atomic=atomic, mode=mode)
+        try:
+            for summary in importer.iter_run(words_data):
+                yield summary
+        finally:
+            if importer.summary['inserted'] or importer.summary['updated']:
+                _after_bulk_write()
     
     @staticmethod
     def update_word(word_id, word_data):
@@ -44,12 +302,22 @@ class WordService:
         if not word:
             return None
         
-        word.content = word_data.get('content', word.content)
+        old_content = word.content
+        # 拼写未变时不重新赋值，避免重算 content_key
+        if word_data.get('content', word.content) != word.content:
+            word.content = word_data['content']
         word.meaning = word_data.get('meaning', word.meaning)
         word.speech = word_data.get('speech', word.speech)
         word.is_wrong = word_data.get('is_wrong', word.is_wrong)
         
-        db.session.commit()
+        try:
+            db.session.flush()
+            version = CatalogService.bump(WORD_CATALOG)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise ValueError('单词已存在')
+        _index_word(word, version, old_content)
         return word
     
     @staticmethod
@@ -58,6 +326,78 @@ class WordService:
         if not word:
             return False
         
+        content = word.content
         db.session.delete(word)
+        version = CatalogService.bump(WORD_CATALOG)
         db.session.commit()
-        return True
\ No newline at end of file
+        _unindex_word(word_id, content, version)
+        return True
+    
+    @staticmethod
+    def bulk_update_words(values, ids=None, filters=None, chunk_size=1000):
+        """把 ids 或匹配 filters 的单词的 values 列批量更新，返回受影响行数"""
+        unknown = [key for key in values if key not in WORD_BULK_UPDATE_FIELDS]
+        if unknown:
+            raise ValueError(f'不支持批量修改的字段: {", ".join(unknown)}')
+        if not values:
+            raise ValueError('缺少要修改的字段')
+        if 'is_wrong' in values:
+            values = {**values, 'is_wrong': parse_bool(values['is_wrong'])}
+        return _run_bulk(
+            lambda chunk: update(Word).where(Word.word_id.in_(chunk)).values(**values),
+            ids, filters, chunk_size
+        )
+    
+    @staticmethod
+    def bulk_delete_words(ids=None, filters=None, chunk_size=1000):
+        """批量删除 ids 或匹配 filters 的单词，返回受影响行数"""
+        return _run_bulk(
+            lambda chunk: delete(Word).where(Word.word_id.in_(chunk)),
+            ids, filters, chunk_size
+        )
+    
+    @staticmethod
+    def search_words(keyword, limit=50, use_index=True):
+        """按关键词搜索单词，结果按 精确 > 前缀 > 子串 > 释义 排序"""
+        if not use_index:
+            return Word.query.filter(
+                Word.content.contains(keyword) |
+                Word.meaning.contains(keyword)
+            ).limit(limit).all()
+        
+        _sync_indexes(word_search_index)
+        word_ids = word_search_index.search(keyword, limit)
+        if not word_ids:
+            return []
+        words = {w.word_id: w for w in Word.query.filter(Word.word_id.in_(word_ids)).all()}
+        return [words[word_id] for word_id in word_ids if word_id in words]
+    
+    @staticmethod
+    def suggest_words(prefix, limit=10):
+        """前缀联想，返回 [(word_id, content)]"""
+        _sync_indexes(word_suggest_index)
+        return word_suggest_index.suggest(prefix, limit)
+    
+    @staticmethod
+    def fuzzy_search(text, max_distance=None, limit=10):
+        """拼写纠错查询，返回 [(word_id, content, distance)]"""
+        _sync_indexes(word_fuzzy_index)
+        return word_fuzzy_index.lookup(text, max_distance, limit)
+    
+    @staticmethod
+    def catalog_version_tag():
+        """单词目录当前版本标识（每次增删改都会变化），用作 ETag"""
+        return CatalogService.etag(WORD_CATALOG)
+    
+    @staticmethod
+    def cache_stats():
+        return word_cache.stats()
+    
+    @staticmethod
+    def index_stats():
+        """内存索引的规模与占用"""
+        return {
+            'search': word_search_index.stats(),
+            'suggest': word_suggest_index.stats(),
+            'fuzzy': word_fuzzy_index.stats()
+        }
\ No newline at end of file
@@ -0,0 +1,120 @@
+import importlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+class MemoryTokenBucketStore:
+    """进程内的令牌桶存储
+
+    只在单进程内有效；多 worker 部署时通过 LOGIN_RATE_LIMIT_BACKEND 换成共享实现
+    （如 Redis 上的 Lua 脚本），该实现需提供 take(key, rate, burst) 方法，
+    令牌足够时扣减一个并返回 True，否则返回 False。
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()   # key -> (剩余令牌, 上次补充时间)
+
+    def take(self, key, rate, burst):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            # 最近访问的放在末尾，超出容量时丢弃最久未访问的桶（等价于桶已回满）
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed
+
+class LoginAdmissionController:
+    """登录接入控制：按账号、按 IP 的令牌桶限速 + 全局进行中哈希校验数上限
+
+    超限请求立即拒绝（429），不排队等待，避免撞库或突发流量把 CPU 耗在密码校验上、拖垮其他接口。
+    """
+
+    def __init__(self):
+        self.store = MemoryTokenBucketStore()
+        self.enabled = True
+        self.account_rate, self.account_burst = 5 / 60, 5
+        self.ip_rate, self.ip_burst = 0.0, 2000     # ip_rate 为 0 时不按 IP 限速
+        self.max_in_flight = 8
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.admitted = 0
+        self.shed = {'account': 0, 'ip': 0, 'concurrency': 0}
+
+    def configure(self, config):
+        self.enabled = config.get('LOGIN_ADMISSION_ENABLED', True)
+        self.account_rate = config.get('LOGIN_ACCOUNT_RATE_PER_MINUTE', 5) / 60
+        self.account_burst = config.get('LOGIN_ACCOUNT_BURST', 5)
+        self.ip_rate = config.get('LOGIN_IP_RATE_PER_MINUTE', 0) / 60
+        self.ip_burst = config.get('LOGIN_IP_BURST', 2000)
+        self.max_in_flight = config.get('LOGIN_MAX_IN_FLIGHT', 8)
+
+    def configure_store(self, app):
+        """按配置替换令牌桶存储，格式为 'package.module:ClassName'，构造参数为 app"""
+        backend_path = app.config.get('LOGIN_RATE_LIMIT_BACKEND')
+        if not backend_path:
+            return
+        module_name, class_name = backend_path.split(':')
+        self.store = getattr(importlib.import_module(module_name), class_name)(app)
+
+    @contextmanager
+    def admit(self, account, ip):
+        """获得准入时产出 None，被拒绝时产出拒绝原因（account / ip / concurrency）"""
+        if not self.enabled:
+            yield None
+            return
+
+        reason = None
+        if self.ip_rate > 0 and not self.store.take(f'login:ip:{ip}', self.ip_rate, self.ip_burst):
+            reason = 'ip'
+        elif not self.store.take(f'login:account:{account}', self.account_rate, self.account_burst):
+            reason = 'account'
+        else:
+            with self._lock:
+                if self._in_flight >= self.max_in_flight:
+                    reason = 'concurrency'
+                else:
+                    self._in_flight += 1
+                    self.admitted += 1
+
+        if reason is not None:
+            with self._lock:
+                self.shed[reason] += 1
+            yield reason
+            return
+
+        try:
+            yield None
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def retry_after(self, reason):
+        """被拒绝后建议的重试间隔（秒）：令牌桶补充一个令牌所需的时间，并发超限时为 1 秒"""
+        rate = {'account': self.account_rate, 'ip': self.ip_rate}.get(reason)
+        if not rate:
+            return 1
+        return max(1, math.ceil(1 / rate))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'ip_limit_enabled': self.ip_rate > 0,
+                'in_flight': self._in_flight,
+                'max_in_flight': self.max_in_flight,
+                'admitted': self.admitted,
+                'shed': dict(self.shed),
+                'shed_total': sum(self.shed.values())
+            }
+
+# 进程级单例
+login_admission = LoginAdmissionController()
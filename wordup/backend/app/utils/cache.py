@@ -0,0 +1,118 @@
+import importlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+
+class LRUCache:
+    """线程安全的有界 LRU 缓存，可选 TTL，带命中/未命中/淘汰计数"""
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()   # key -> (value, 过期时间或 None)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+class LocalInvalidationBackend:
+    """进程内的失效通道，发布即立即在本进程分发
+
+    只在单进程内有效，是共享通道的本地替身；多 worker 部署时通过
+    CACHE_INVALIDATION_BACKEND 换成跨进程实现（如 Redis pub/sub），
+    该实现需提供 start(dispatch) 与 publish(topic, key) 两个方法，
+    并在收到其他进程的消息时调用 dispatch(topic, key)。
+    """
+
+    def start(self, dispatch):
+        self._dispatch = dispatch
+
+    def publish(self, topic, key=None):
+        self._dispatch(topic, key)
+
+class InvalidationBus:
+    """缓存失效消息总线：写操作发布主题，各缓存按主题订阅"""
+
+    def __init__(self):
+        self._subscribers = defaultdict(list)
+        self.backend = None
+        self.configure(LocalInvalidationBackend())
+
+    def configure(self, backend):
+        backend.start(self.dispatch)
+        self.backend = backend
+
+    def subscribe(self, topic, callback):
+        """callback(key)，key 为 None 表示整个主题失效"""
+        self._subscribers[topic].append(callback)
+
+    def publish(self, topic, key=None):
+        self.backend.publish(topic, key)
+
+    def dispatch(self, topic, key=None):
+        for callback in self._subscribers[topic]:
+            callback(key)
+
+# 进程级单例
+invalidation_bus = InvalidationBus()
+
+def configure_invalidation_bus(app):
+    """按配置替换失效通道的实现，格式为 'package.module:ClassName'"""
+    backend_path = app.config.get('CACHE_INVALIDATION_BACKEND')
+    if not backend_path:
+        return
+    module_name, class_name = backend_path.split(':')
+    backend_class = getattr(importlib.import_module(module_name), class_name)
+    invalidation_bus.configure(backend_class(app))
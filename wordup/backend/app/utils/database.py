@@ -1,7 +1,51 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
 from app import db
 
+# 新增列加入已有表后需要执行的数据回填，键为 (表名, 列名)
+COLUMN_BACKFILLS = {
+    # 已有重复拼写时只为每组中 word_id 最小的一行生成 content_key，其余保持 NULL，避免唯一索引创建失败
+    ('word', 'content_key'): """
+        UPDATE word SET content_key = LOWER(TRIM(content))
+        WHERE word_id IN (
+            SELECT word_id FROM (
+                SELECT MIN(word_id) AS word_id FROM word GROUP BY LOWER(TRIM(content))
+            ) AS first_words
+        )
+    """,
+}
+
 def init_db(app):
     """初始化数据库"""
     with app.app_context():
-        db.create_all()
\ No newline at end of file
+        db.create_all()
+        upgrade_schema()
+
+def upgrade_schema():
+    """为已存在的表补充模型中新增的列和索引
+
+    项目没有使用迁移工具，db.create_all() 只会创建缺失的表，
+    这里负责把后续给旧表新增的列、回填数据和索引同步到数据库。
+    """
+    engine = db.engine
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        tables = [table for table in db.metadata.sorted_tables if inspector.has_table(table.name)]
+        existing = {table.name: {column['name'] for column in inspector.get_columns(table.name)}
+                    for table in tables}
+
+    for table in tables:
+        for column in table.columns:
+            if column.name in existing[table.name]:
+                continue
+            # MySQL 的 DDL 会隐式提交，每个新增列及其回填单独放在一个事务里
+            column_sql = CreateColumn(column).compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column_sql}'))
+                backfill = COLUMN_BACKFILLS.get((table.name, column.name))
+                if backfill:
+                    conn.execute(text(backfill))
+        with engine.begin() as conn:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
@@ -1,4 +1,7 @@
+import base64
 import json
+import sys
+from array import array
 from datetime import datetime
 
 def json_serial(obj):
@@ -7,6 +10,26 @@ def json_serial(obj):
         return obj.isoformat()
     raise TypeError(f"Type {type(obj)} not serializable")
 
+def parse_bool(value, default=False):
+    """解析请求中的布尔值：JSON 布尔、0/1 或 'true'/'false'/'1'/'0'/'yes'/'no' 字符串，无法识别时抛出 ValueError"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ('1', 'true', 'yes', 'on'):
+            return True
+        if text in ('0', 'false', 'no', 'off', ''):
+            return False
+    raise ValueError(f'无效的布尔值: {value}')
+
+def normalize_content(text):
+    """单词拼写的规范形式（去首尾空白、小写），用于去重与索引"""
+    return (text or '').strip().lower()
+
 def success_response(data=None, message="操作成功"):
     """成功响应格式"""
     return {
@@ -15,10 +38,49 @@ def success_response(data=None, message="操作成功"):
         'data': data
     }
 
+def raw_success_response(data_json, message="操作成功"):
+    """data 已序列化为 JSON（bytes）时的成功响应，避免重复序列化"""
+    from flask import Response
+    head = json.dumps({'success': True, 'message': message}, ensure_ascii=False)[:-1]
+    body = head.encode('utf-8') + b', "data": ' + data_json + b'}'
+    return Response(body, mimetype='application/json')
+
 def error_response(message="操作失败", code=400):
     """错误响应格式"""
     return {
         'success': False,
         'message': message,
         'code': code
-    }, code
\ No newline at end of file
+    }, code
+
+def encode_cursor(*values):
+    """将键集分页的位置编码为不透明游标"""
+    raw = json.dumps(list(values), separators=(',', ':'), default=json_serial)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """解析游标，格式错误时抛出 ValueError"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise ValueError('无效的游标')
+    if not isinstance(values, list):
+        raise ValueError('无效的游标')
+    return values
+
+def pack_ids(ids):
+    """把非负整数 ID 列表打包为定长 4 字节小端序的二进制串（保持顺序）"""
+    packed = array('I', ids)
+    if sys.byteorder == 'big':
+        packed.byteswap()
+    return packed.tobytes()
+
+def unpack_ids(blob):
+    """pack_ids 的逆操作，返回 array('I')"""
+    ids = array('I')
+    if blob:
+        ids.frombytes(blob)
+        if sys.byteorder == 'big':
+            ids.byteswap()
+    return ids
\ No newline at end of file
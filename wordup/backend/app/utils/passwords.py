@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+
+class PasswordHasher:
+    """可配置的密码哈希器
+
+    哈希方法与参数来自配置（PASSWORD_HASH_METHOD / PASSWORD_SALT_LENGTH），
+    登录成功时若已存哈希的方法或参数与配置不同，由调用方用明文重新哈希。
+    KDF 计算放在有界线程池中执行（hashlib 计算期间释放 GIL），
+    同时进行的哈希数不超过 PASSWORD_HASH_WORKERS，其余请求排队等待，不会把 CPU 全部占满。
+    批量哈希（名单导入）使用另一个常驻的有界线程池（PASSWORD_BULK_HASH_WORKERS），
+    不在 web worker 里 fork 子进程，也不会让登录排在成千上万个导入哈希之后。
+    """
+
+    def __init__(self, method='pbkdf2', salt_length=16, workers=4, bulk_workers=4):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._bulk_executor = None
+        self.configure({
+            'PASSWORD_HASH_METHOD': method,
+            'PASSWORD_SALT_LENGTH': salt_length,
+            'PASSWORD_HASH_WORKERS': workers,
+            'PASSWORD_BULK_HASH_WORKERS': bulk_workers
+        })
+
+    def configure(self, config):
+        with self._lock:
+            self.method = config.get('PASSWORD_HASH_METHOD', 'pbkdf2')
+            self.salt_length = config.get('PASSWORD_SALT_LENGTH', 16)
+            self.workers = config.get('PASSWORD_HASH_WORKERS', 4)
+            # 配置里可以只写 'pbkdf2'，已存哈希里记录的是展开后的 'pbkdf2:sha256:600000'，首次比较时再求出
+            self._method_prefix = None
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-kdf') \
+                if self.workers > 0 else None
+            self.bulk_workers = config.get('PASSWORD_BULK_HASH_WORKERS', 4)
+            if self._bulk_executor is not None:
+                self._bulk_executor.shutdown(wait=False)
+            self._bulk_executor = ThreadPoolExecutor(max_workers=self.bulk_workers,
+                                                     thread_name_prefix='password-kdf-bulk') \
+                if self.bulk_workers > 0 else None
+
+    def _run(self, fn, *args):
+        executor = self._executor
+        if executor is None:
+            return fn(*args)
+        return executor.submit(fn, *args).result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method, self.salt_length)
+
+    def hash_many(self, passwords):
+        """批量哈希（名单导入用），在常驻的批量线程池中并行计算（hashlib 计算期间释放 GIL）"""
+        executor = self._bulk_executor
+        if executor is None or len(passwords) < 2:
+            return [generate_password_hash(p, self.method, self.salt_length) for p in passwords]
+        return list(executor.map(lambda p: generate_password_hash(p, self.method, self.salt_length), passwords))
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """已存哈希的方法、参数或盐长度与当前配置不一致时返回 True"""
+        if self._method_prefix is None:
+            self._method_prefix = generate_password_hash('', self.method, 1).split('$', 1)[0]
+        parts = pwhash.split('$', 2)
+        if len(parts) != 3:
+            return True
+        method, salt, _ = parts
+        return method != self._method_prefix or len(salt) != self.salt_length
+
+# 进程级单例
+password_hasher = PasswordHasher()
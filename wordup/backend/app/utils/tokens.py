@@ -0,0 +1,59 @@
+from functools import wraps
+from flask import current_app, request, session, g
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from app.utils.helpers import error_response
+
+TOKEN_SALT = 'wordup-auth-token'
+
+def _serializer():
+    return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt=TOKEN_SALT)
+
+def issue_token(user_id, user_type, class_id=None):
+    """签发携带用户 id、类型、班级的短期令牌，返回 (token, 有效秒数)"""
+    token = _serializer().dumps({'uid': user_id, 'type': user_type, 'cid': class_id})
+    return token, current_app.config.get('AUTH_TOKEN_TTL', 3600)
+
+def verify_token(token, max_age=None):
+    """校验签名与有效期，返回 {'user_id', 'user_type', 'class_id'}；无效时抛出 BadSignature"""
+    if max_age is None:
+        max_age = current_app.config.get('AUTH_TOKEN_TTL', 3600)
+    payload = _serializer().loads(token, max_age=max_age)
+    return {'user_id': payload['uid'], 'user_type': payload['type'], 'class_id': payload.get('cid')}
+
+def bearer_token():
+    header = request.headers.get('Authorization', '')
+    if header.startswith('Bearer '):
+        return header[len('Bearer '):].strip() or None
+    return None
+
+def auth_required(*user_types):
+    """校验请求身份并写入 g.current_user，不查询数据库
+
+    优先使用 Authorization: Bearer 令牌；未携带令牌或令牌过期/无效时回退到原有的 cookie session，
+    两者都不可用才返回 401。传入 user_types 时只允许这些类型的用户访问。
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            user = None
+            message = '未登录'
+            token = bearer_token()
+            if token:
+                try:
+                    user = verify_token(token)
+                except SignatureExpired:
+                    message = '登录已过期'
+                except BadSignature:
+                    message = '无效的令牌'
+            if user is None:
+                if not (session.get('user_id') and session.get('user_type')):
+                    return error_response(message, 401)
+                user = {'user_id': session['user_id'], 'user_type': session['user_type'],
+                        'class_id': session.get('class_id')}
+
+            if user_types and user['user_type'] not in user_types:
+                return error_response('没有权限', 403)
+            g.current_user = user
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,90 @@
+"""用户编号分配基准测试：排序查询最大编号 vs 按块预留的 IdAllocator
+
+用法: python benchmark_ids.py [--workers 4] [--creates 500] [--block-sizes 1,20,100]
+每个 worker 线程持有独立的分配器实例（模拟独立的 worker 进程），并发创建学生，
+统计吞吐、编号冲突次数以及访问 id_counter 的次数。
+默认使用临时 SQLite 数据库，可通过 BENCH_DATABASE_URL 指向 MySQL 测试库。
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_tmp_dir = tempfile.mkdtemp(prefix='wordup_bench_')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL') or \
+    f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}?timeout=60"
+
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app import create_app, db
+from app.models import Student, IdCounter
+from app.services.id_allocator import IdAllocator
+
+def reset():
+    db.session.query(Student).delete()
+    db.session.query(IdCounter).delete()
+    db.session.commit()
+
+class LegacyAllocator:
+    """原 create_user 的做法：每次按字符串主键倒序取最大编号再加一"""
+
+    def __init__(self):
+        self.reservations = 0
+
+    def allocate(self, kind):
+        self.reservations += 1
+        last = Student.query.order_by(Student.student_id.desc()).first()
+        return f"student{int(last.student_id[7:]) + 1:03d}" if last else "student001"
+
+def run(app, label, make_allocator, workers, creates):
+    with app.app_context():
+        reset()
+
+    def worker(worker_index):
+        allocator = make_allocator()
+        created = conflicts = lock_timeouts = 0
+        with app.app_context():
+            for i in range(creates // workers):
+                student = Student(student_id=allocator.allocate('student'), name='压测学生',
+                                  account=f'bench{worker_index}_{i}', password='x')
+                db.session.add(student)
+                try:
+                    db.session.commit()
+                    created += 1
+                except IntegrityError:
+                    db.session.rollback()
+                    conflicts += 1
+                except OperationalError:
+                    # SQLite 的库级写锁等待超时，MySQL 上不会出现
+                    db.session.rollback()
+                    lock_timeouts += 1
+        return created, conflicts, lock_timeouts, allocator.reservations
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(worker, range(workers)))
+    elapsed = time.perf_counter() - start
+
+    created = sum(r[0] for r in results)
+    conflicts = sum(r[1] for r in results)
+    lock_timeouts = sum(r[2] for r in results)
+    reservations = sum(r[3] for r in results)
+    print(f"{label:<22} | {created / elapsed:8.1f} 个/秒 | 成功 {created:>5} | 编号冲突 {conflicts:>5} | "
+          f"锁超时 {lock_timeouts:>3} | 查询编号次数 {reservations:>5}")
+
+def main():
+    parser = argparse.ArgumentParser(description='用户编号分配基准测试')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--creates', type=int, default=500)
+    parser.add_argument('--block-sizes', default='1,20,100')
+    args = parser.parse_args()
+
+    app = create_app()
+    print(f"🆔 用户编号分配基准测试 ({args.workers} 个 worker, 共 {args.creates} 次创建)")
+    print("=" * 50)
+    run(app, 'ORDER BY 最大编号', LegacyAllocator, args.workers, args.creates)
+    for block_size in [int(b) for b in args.block_sizes.split(',')]:
+        run(app, f'IdAllocator 块={block_size}', lambda: IdAllocator(block_size), args.workers, args.creates)
+
+if __name__ == '__main__':
+    main()
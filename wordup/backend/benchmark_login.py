@@ -0,0 +1,104 @@
+"""登录吞吐基准测试：不同密码哈希参数与 KDF 线程池大小的取舍
+
+用法: python benchmark_login.py [--methods pbkdf2:sha256:600000,pbkdf2:sha256:100000,scrypt:16384:8:1]
+                               [--workers 0,2,4] [--clients 16] [--logins 200]
+每组参数下用 clients 个并发线程发起 logins 次登录，同时测量 /api/health 的延迟，
+以观察登录高峰时其他接口是否被拖慢。
+默认使用临时 SQLite 数据库，可通过 BENCH_DATABASE_URL 指向 MySQL 测试库。
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+_tmp_dir = tempfile.mkdtemp(prefix='wordup_bench_')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL') or \
+    f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from app import create_app, db
+from app.models import Student
+from app.utils.admission import login_admission
+from app.utils.passwords import password_hasher
+
+PASSWORD = 'bench-password'
+
+def populate(count):
+    db.session.query(Student).delete()
+    db.session.commit()
+    pwhash = password_hasher.hash(PASSWORD)
+    db.session.execute(Student.__table__.insert(), [
+        {'student_id': f'bench{i}', 'name': f'压测学生{i}', 'account': f'bench{i}', 'password': pwhash}
+        for i in range(count)
+    ])
+    db.session.commit()
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000
+
+def run(app, method, workers, clients, logins, accounts):
+    app.config['PASSWORD_HASH_METHOD'] = method
+    app.config['PASSWORD_HASH_WORKERS'] = workers
+    password_hasher.configure(app.config)
+    with app.app_context():
+        populate(accounts)
+
+    def login(i):
+        client = app.test_client()
+        start = time.perf_counter()
+        response = client.post('/api/auth/login', json={
+            'account': f'bench{i % accounts}', 'password': PASSWORD, 'user_type': 'student'
+        })
+        assert response.status_code == 200, response.get_json()
+        return time.perf_counter() - start
+
+    # 登录压测期间持续探测其他接口的延迟
+    health_latencies = []
+    stop = threading.Event()
+
+    def probe():
+        client = app.test_client()
+        while not stop.is_set():
+            start = time.perf_counter()
+            client.get('/api/health')
+            health_latencies.append(time.perf_counter() - start)
+            time.sleep(0.005)
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        latencies = list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    prober.join()
+
+    print(f"{method:<24} | KDF 线程 {workers:>2} | {logins / elapsed:7.1f} 次/秒 | "
+          f"登录 p50 {percentile(latencies, 0.5):7.1f} ms p95 {percentile(latencies, 0.95):7.1f} ms | "
+          f"health p95 {percentile(health_latencies, 0.95):6.1f} ms "
+          f"(中位 {statistics.median(health_latencies) * 1000:5.1f} ms)")
+
+def main():
+    parser = argparse.ArgumentParser(description='登录吞吐基准测试')
+    parser.add_argument('--methods', default='pbkdf2:sha256:600000,pbkdf2:sha256:100000,scrypt:16384:8:1')
+    parser.add_argument('--workers', default=f'0,2,{os.cpu_count() or 4}')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--accounts', type=int, default=100)
+    args = parser.parse_args()
+
+    app = create_app()
+    # 基准测试衡量的是哈希本身的吞吐，关闭登录限流
+    app.config['LOGIN_ADMISSION_ENABLED'] = False
+    login_admission.configure(app.config)
+    print(f"🔐 登录吞吐基准测试 ({args.clients} 并发, {args.logins} 次登录, CPU {os.cpu_count()})")
+    print("=" * 50)
+    for method in args.methods.split(','):
+        for workers in [int(w) for w in args.workers.split(',')]:
+            run(app, method, workers, args.clients, args.logins, args.accounts)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""单词搜索基准测试：n-gram 倒排索引 vs LIKE 全表扫描
+
+用法: python benchmark_search.py [--sizes 10000,100000,1000000] [--queries 200]
+默认使用临时 SQLite 数据库，可通过 BENCH_DATABASE_URL 指向 MySQL 测试库。
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+_tmp_dir = tempfile.mkdtemp(prefix='wordup_bench_')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL') or \
+    f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from app import create_app, db
+from app.models import Word
+from app.services.search_index import WordSearchIndex
+
+CJK_CHARS = '放弃能力关于上面接受事故实现行动活动地址承认成人建议影响害怕之后年龄同意目的空气允许几乎一起已经虽然总是数量古老愤怒动物回答'
+SPEECHES = ['n.', 'v.', 'adj.', 'adv.', 'prep.']
+
+def random_word(rng):
+    length = rng.randint(3, 12)
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+def random_meaning(rng):
+    return ''.join(rng.choice(CJK_CHARS) for _ in range(rng.randint(2, 8)))
+
+def populate(size, rng, chunk=10000):
+    db.session.query(Word).delete()
+    db.session.commit()
+    contents = []
+    for start in range(0, size, chunk):
+        rows = []
+        for _ in range(min(chunk, size - start)):
+            content = random_word(rng)
+            contents.append(content)
+            rows.append({
+                'content': content,
+                'meaning': random_meaning(rng),
+                'speech': rng.choice(SPEECHES),
+                'is_wrong': False
+            })
+        db.session.execute(Word.__table__.insert(), rows)
+        db.session.commit()
+    return contents
+
+def make_queries(contents, rng, count):
+    queries = []
+    for _ in range(count):
+        kind = rng.random()
+        word = rng.choice(contents)
+        if kind < 0.4:
+            queries.append(word[:rng.randint(2, len(word))])              # 前缀
+        elif kind < 0.7:
+            i = rng.randint(0, len(word) - 2)
+            queries.append(word[i:i + rng.randint(2, 4)])                 # 子串
+        elif kind < 0.9:
+            queries.append(CJK_CHARS[rng.randint(0, len(CJK_CHARS) - 2):][:2])  # 中文释义
+        else:
+            queries.append(random_word(rng))                              # 多半无结果
+    return queries
+
+def time_queries(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+def run(size, query_count, limit, rng):
+    contents = populate(size, rng)
+    queries = make_queries(contents, rng, query_count)
+
+    index = WordSearchIndex()
+    start = time.perf_counter()
+    index.build()
+    build_seconds = time.perf_counter() - start
+
+    def like_search(q):
+        return db.session.query(Word.word_id).filter(
+            Word.content.contains(q) | Word.meaning.contains(q)
+        ).limit(limit).all()
+
+    like_ms = time_queries(like_search, queries)
+    index_ms = time_queries(lambda q: index.search(q, limit), queries)
+    stats = index.stats()
+    print(f"{size:>9,} 词 | 索引构建 {build_seconds:7.2f}s | "
+          f"LIKE {like_ms:8.3f} ms/次 | 索引 {index_ms:8.3f} ms/次 | "
+          f"加速 {like_ms / index_ms:7.1f}x | grams {stats['content_grams'] + stats['meaning_grams']:,}")
+
+def main():
+    parser = argparse.ArgumentParser(description='单词搜索基准测试')
+    parser.add_argument('--sizes', default='10000,100000,1000000')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app()
+    rng = random.Random(args.seed)
+    with app.app_context():
+        print("🔍 单词搜索基准测试 (LIKE vs n-gram 索引)")
+        print("=" * 50)
+        for size in [int(s) for s in args.sizes.split(',')]:
+            run(size, args.queries, args.limit, rng)
+
+if __name__ == '__main__':
+    main()
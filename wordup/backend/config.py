@@ -10,6 +10,90 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.getenv('SECRET_KEY') or 'dev-secret-key-change-in-production'
     
+    # 登录令牌：有效期（秒），以及过期后仍可用 /api/auth/refresh 续期的时间窗口
+    AUTH_TOKEN_TTL = int(os.getenv('AUTH_TOKEN_TTL', 3600))
+    AUTH_TOKEN_REFRESH_TTL = int(os.getenv('AUTH_TOKEN_REFRESH_TTL', 7 * 24 * 3600))
+    
+    # 单词分页配置
+    WORDS_PAGE_DEFAULT_LIMIT = int(os.getenv('WORDS_PAGE_DEFAULT_LIMIT', 100))
+    WORDS_PAGE_MAX_LIMIT = int(os.getenv('WORDS_PAGE_MAX_LIMIT', 1000))
+    
+    # 用户列表分页配置
+    USERS_PAGE_DEFAULT_LIMIT = int(os.getenv('USERS_PAGE_DEFAULT_LIMIT', 50))
+    USERS_PAGE_MAX_LIMIT = int(os.getenv('USERS_PAGE_MAX_LIMIT', 500))
+    
+    # 任务时间窗口列表（进行中/未开始/已结束）分页配置
+    TASKS_PAGE_DEFAULT_LIMIT = int(os.getenv('TASKS_PAGE_DEFAULT_LIMIT', 20))
+    TASKS_PAGE_MAX_LIMIT = int(os.getenv('TASKS_PAGE_MAX_LIMIT', 100))
+    # 单个任务最多包含的单词数
+    TASK_MAX_WORDS = int(os.getenv('TASK_MAX_WORDS', 5000))
+    # 任务发布扇出的后台线程数（0 表示在请求线程中同步执行）
+    TASK_PUBLISH_WORKERS = int(os.getenv('TASK_PUBLISH_WORKERS', 2))
+    # 发布租约（秒）：pending/running 状态超过该时间没有进展视为执行的 worker 已中断，允许重新发布
+    TASK_PUBLISH_LEASE = int(os.getenv('TASK_PUBLISH_LEASE', 600))
+    
+    # 单词搜索：是否使用进程内 n-gram 索引（关闭时回退为 LIKE 查询）
+    WORD_SEARCH_INDEX_ENABLED = os.getenv('WORD_SEARCH_INDEX_ENABLED', 'true').lower() == 'true'
+    SEARCH_RESULT_LIMIT = int(os.getenv('SEARCH_RESULT_LIMIT', 50))
+    
+    # 拼写纠错：允许的最大编辑距离、建立删除索引的前缀长度
+    FUZZY_MAX_DISTANCE = int(os.getenv('FUZZY_MAX_DISTANCE', 2))
+    FUZZY_PREFIX_LENGTH = int(os.getenv('FUZZY_PREFIX_LENGTH', 7))
+    
+    # 单词批量导入每块行数（每块一次多行 INSERT）
+    WORD_IMPORT_CHUNK_SIZE = int(os.getenv('WORD_IMPORT_CHUNK_SIZE', 1000))
+    # 客户端指定 chunk_size 时允许的上限
+    WORD_IMPORT_MAX_CHUNK_SIZE = int(os.getenv('WORD_IMPORT_MAX_CHUNK_SIZE', 5000))
+    # 单词批量修改/删除每个事务处理的行数
+    WORD_BULK_CHUNK_SIZE = int(os.getenv('WORD_BULK_CHUNK_SIZE', 1000))
+    
+    # 密码哈希：werkzeug 的方法串（如 pbkdf2:sha256:600000、scrypt:32768:8:1），
+    # 登录成功时已存哈希与配置不一致会自动用新参数重新哈希
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:600000')
+    PASSWORD_SALT_LENGTH = int(os.getenv('PASSWORD_SALT_LENGTH', 16))
+    # 同时进行 KDF 计算的线程数上限（0 表示直接在请求线程中计算）
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 4))
+    # 批量哈希（名单导入）常驻线程池的线程数上限（0 表示在请求线程中顺序计算）；与登录线程池相互独立，默认用满所有核
+    PASSWORD_BULK_HASH_WORKERS = int(os.getenv('PASSWORD_BULK_HASH_WORKERS', os.cpu_count() or 4))
+    
+    # 反向代理层数：大于 0 时按 X-Forwarded-For 中由这些代理追加的地址识别客户端 IP（ProxyFix）
+    TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', 0))
+    
+    # 登录接入控制：按账号、按 IP 的令牌桶（每分钟补充数 / 桶容量）与全局进行中校验数上限。
+    # 全校学生常在同一 NAT 出口后同时登录，按 IP 限速默认关闭（每分钟补充数为 0），
+    # 启用时桶容量应大于同一出口后的学生数
+    LOGIN_ADMISSION_ENABLED = os.getenv('LOGIN_ADMISSION_ENABLED', 'true').lower() == 'true'
+    LOGIN_ACCOUNT_RATE_PER_MINUTE = float(os.getenv('LOGIN_ACCOUNT_RATE_PER_MINUTE', 5))
+    LOGIN_ACCOUNT_BURST = int(os.getenv('LOGIN_ACCOUNT_BURST', 5))
+    LOGIN_IP_RATE_PER_MINUTE = float(os.getenv('LOGIN_IP_RATE_PER_MINUTE', 0))
+    LOGIN_IP_BURST = int(os.getenv('LOGIN_IP_BURST', 2000))
+    LOGIN_MAX_IN_FLIGHT = int(os.getenv('LOGIN_MAX_IN_FLIGHT', 2 * (os.cpu_count() or 4)))
+    # 令牌桶共享存储，'package.module:ClassName'；为空时使用进程内存储（仅单 worker 有效）
+    LOGIN_RATE_LIMIT_BACKEND = os.getenv('LOGIN_RATE_LIMIT_BACKEND')
+    
+    # /api/auth/me 用户资料缓存（TTL 秒兜底其他 worker 的修改）
+    USER_PROFILE_CACHE_ENABLED = os.getenv('USER_PROFILE_CACHE_ENABLED', 'true').lower() == 'true'
+    USER_PROFILE_CACHE_SIZE = int(os.getenv('USER_PROFILE_CACHE_SIZE', 10000))
+    USER_PROFILE_CACHE_TTL = int(os.getenv('USER_PROFILE_CACHE_TTL', 60))
+    
+    # 学生名单导入：每条 INSERT 的行数
+    ROSTER_IMPORT_CHUNK_SIZE = int(os.getenv('ROSTER_IMPORT_CHUNK_SIZE', 500))
+    
+    # 用户编号分配：每个 worker 一次从 id_counter 表预留的编号数
+    ID_BLOCK_SIZE = int(os.getenv('ID_BLOCK_SIZE', 20))
+    
+    # 班级看板缓存（成绩经 ORM 提交后按班级失效，TTL 秒兜底）与每个任务列出的最低分学生数
+    CLASS_DASHBOARD_CACHE_ENABLED = os.getenv('CLASS_DASHBOARD_CACHE_ENABLED', 'true').lower() == 'true'
+    CLASS_DASHBOARD_CACHE_SIZE = int(os.getenv('CLASS_DASHBOARD_CACHE_SIZE', 1000))
+    CLASS_DASHBOARD_CACHE_TTL = int(os.getenv('CLASS_DASHBOARD_CACHE_TTL', 300))
+    CLASS_DASHBOARD_LOWEST_COUNT = int(os.getenv('CLASS_DASHBOARD_LOWEST_COUNT', 5))
+    
+    # 单词读缓存（单词 LRU + 全量列表快照）
+    WORD_CACHE_ENABLED = os.getenv('WORD_CACHE_ENABLED', 'true').lower() == 'true'
+    WORD_CACHE_SIZE = int(os.getenv('WORD_CACHE_SIZE', 10000))
+    # 缓存失效通道，'package.module:ClassName'；为空时使用进程内通道（仅单 worker 有效）
+    CACHE_INVALIDATION_BACKEND = os.getenv('CACHE_INVALIDATION_BACKEND')
+    
 class DevelopmentConfig(Config):
     DEBUG = True
 
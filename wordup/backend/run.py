@@ -12,5 +12,6 @@ if __name__ == '__main__':
     print("  - 班级: http://localhost:5000/api/classes/")
     print("  - 任务: http://localhost:5000/api/tasks/")
     print("  - 成绩: http://localhost:5000/api/scores/")
+    print("  - 导出: http://localhost:5000/api/export/<words|scores|users>")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
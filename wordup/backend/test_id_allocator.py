@@ -0,0 +1,52 @@
+"""客户端指定编号与按块分配互不冲突的回归测试（使用临时 SQLite 数据库，可直接用 pytest 运行）"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(_db_dir, "ids.db")}'
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+
+import pytest
+from app import create_app, db
+from app.models import Teacher, IdCounter
+from app.services.id_allocator import IdAllocator, id_allocator
+
+@pytest.fixture()
+def app():
+    app = create_app()
+    with app.app_context():
+        Teacher.query.delete()
+        IdCounter.query.delete()
+        db.session.commit()
+    id_allocator.configure(app.config)
+    yield app
+
+def _register(client, **data):
+    return client.post('/api/auth/register/teacher', json={'name': 't', 'password': 'x', **data})
+
+def test_id_inside_another_workers_block_is_rejected(app):
+    client = app.test_client()
+    other = IdAllocator(block_size=20)
+    with app.app_context():
+        assert other.allocate('teacher') == 'teacher001'
+    
+    response = _register(client, teacher_id='teacher005', account='a1')
+    assert response.status_code == 400
+    with app.app_context():
+        assert [other.allocate('teacher') for _ in range(4)][-1] == 'teacher005'
+
+def test_id_above_counter_is_claimed(app):
+    client = app.test_client()
+    with app.app_context():
+        id_allocator.allocate('teacher')
+    
+    assert _register(client, teacher_id='teacher050', account='a1').status_code == 200
+    with app.app_context():
+        assert db.session.get(IdCounter, 'teacher').next_value == 51
+        assert IdAllocator().allocate('teacher') == 'teacher051'
+
+def test_missing_id_is_allocated(app):
+    client = app.test_client()
+    response = _register(client, account='a1')
+    assert response.status_code == 200
+    assert response.get_json()['data']['user_id'] == 'teacher001'
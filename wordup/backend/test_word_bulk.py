@@ -0,0 +1,54 @@
+"""批量修改/删除单词的筛选条件回归测试（使用临时 SQLite 数据库，可直接用 pytest 运行）"""
+import os
+import tempfile
+
+_db_dir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(_db_dir, "bulk.db")}'
+
+import pytest
+from app import create_app, db
+from app.models import Word
+from app.services.word_service import WordService
+
+@pytest.fixture()
+def client():
+    app = create_app()
+    with app.app_context():
+        Word.query.delete()
+        db.session.add_all([Word(content=f'word{i}', meaning=f'意思{i}', speech='n.') for i in range(10)])
+        db.session.commit()
+    yield app, app.test_client()
+
+def _word_count(app):
+    with app.app_context():
+        return Word.query.count()
+
+@pytest.mark.parametrize('prefix', ['', '   ', None, 123])
+def test_blank_prefix_is_rejected(client, prefix):
+    app, c = client
+    body = {'filter': {'content_prefix': prefix}}
+    
+    response = c.delete('/api/words/bulk', json=body)
+    assert response.status_code == 400
+    response = c.patch('/api/words/bulk', json={**body, 'set': {'meaning': 'x'}})
+    assert response.status_code == 400
+    assert _word_count(app) == 10
+
+def test_filter_without_clauses_is_rejected(client):
+    app, c = client
+    with app.app_context():
+        for filters in ({}, None):
+            with pytest.raises(ValueError):
+                WordService.bulk_delete_words(filters=filters)
+            with pytest.raises(ValueError):
+                WordService.bulk_update_words({'meaning': 'x'}, filters=filters)
+    assert c.delete('/api/words/bulk', json={'filter': {}}).status_code == 400
+    assert _word_count(app) == 10
+
+def test_prefix_filter_deletes_only_matches(client):
+    app, c = client
+    c.post('/api/words/', json={'content': 'apple', 'meaning': '苹果'})
+    
+    response = c.delete('/api/words/bulk', json={'filter': {'content_prefix': ' App '}})
+    assert response.get_json()['data'] == {'affected': 1}
+    assert _word_count(app) == 10
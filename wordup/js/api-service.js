@@ -28,8 +28,14 @@ class ApiService {
         localStorage.setItem('authToken', token);
     }
 
+    // 清除本地令牌（之后的请求只依赖 cookie session）
+    clearToken() {
+        this.token = null;
+        localStorage.removeItem('authToken');
+    }
+
     // 通用请求方法
-    async request(endpoint, options = {}) {
+    async request(endpoint, options = {}, retried = false) {
         const url = `${this.baseURL}${endpoint}`;
         const config = {
             headers: {
@@ -47,8 +53,18 @@ class ApiService {
             console.log(`发起API请求: ${url}`, config);
             const response = await fetch(url, config);
             
+            // 令牌过期：续期一次后重试；续期失败则丢弃令牌，按 cookie session 重试
+            if (response.status === 401 && this.token && !retried && !endpoint.startsWith('/auth/')) {
+                await this.tryRefreshToken();
+                return await this.request(endpoint, options, true);
+            }
+            
             if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
+                // 带上后端返回的错误信息（如校验失败原因）
+                const body = await response.json().catch(() => null);
+                const httpError = new Error((body && body.message) || `HTTP error! status: ${response.status}`);
+                httpError.status = response.status;
+                throw httpError;
             }
             
             const data = await response.json();
@@ -58,6 +74,11 @@ class ApiService {
             console.error('请求URL:', url);
             console.error('错误详情:', error.message);
             
+            // 服务器已响应的错误原样抛出，不当作网络故障
+            if (error.status) {
+                throw error;
+            }
+            
             // 提供更友好的错误信息
             let userMessage = '网络请求失败，请检查：\n';
             userMessage += '1. 后端服务是否运行 (localhost:5000)\n';
@@ -81,7 +102,11 @@ class ApiService {
             });
             
             if (data.success && data.data) {
-                this.setToken(data.data.token || 'mock-token');
+                if (data.data.token) {
+                    this.setToken(data.data.token);
+                } else {
+                    this.clearToken();
+                }
             }
             
             return data;
@@ -95,18 +120,64 @@ class ApiService {
         const data = await this.request('/auth/logout', {
             method: 'POST'
         });
-        localStorage.removeItem('authToken');
+        this.clearToken();
         return data;
     }
 
+    // 令牌过期前（或过期后的续期窗口内）换取新令牌
+    async refreshToken() {
+        const data = await this.request('/auth/refresh', {
+            method: 'POST'
+        });
+        if (data.success && data.data) {
+            this.setToken(data.data.token);
+        }
+        return data;
+    }
+
+    // 用当前令牌续期，失败时清除令牌；返回是否续期成功
+    async tryRefreshToken() {
+        try {
+            const data = await this.refreshToken();
+            if (data.success && data.data && data.data.token) {
+                return true;
+            }
+        } catch (error) {
+            console.warn('令牌续期失败:', error);
+        }
+        this.clearToken();
+        return false;
+    }
+
     async getCurrentUser() {
         return await this.request('/auth/me');
     }
 
     // 单词相关API
     async getWords() {
-        const data = await this.request('/words/');
-        return data.data || [];
+        // 按游标分页拉取，避免一次性传输整个单词表
+        const words = [];
+        let cursor = null;
+        do {
+            const page = await this.getWordsPage({ limit: 500, after: cursor });
+            words.push(...page.items);
+            cursor = page.next_cursor;
+        } while (cursor);
+        return words;
+    }
+
+    // 分页获取单词: options = { limit, after, fields }
+    async getWordsPage(options = {}) {
+        const params = new URLSearchParams();
+        params.set('limit', options.limit || 100);
+        if (options.after) {
+            params.set('after', options.after);
+        }
+        if (options.fields) {
+            params.set('fields', Array.isArray(options.fields) ? options.fields.join(',') : options.fields);
+        }
+        const data = await this.request(`/words/?${params.toString()}`);
+        return data.data || { items: [], next_cursor: null, has_more: false };
     }
 
     async getWord(wordId) {
@@ -151,12 +222,31 @@ class ApiService {
         return data;
     }
 
+    // 批量修改: target 为 { ids: [...] } 或 { filter: {...} }，values 为要设置的字段
+    async bulkUpdateWords(target, values) {
+        const data = await this.request('/words/bulk', {
+            method: 'PATCH',
+            body: JSON.stringify({ ...target, set: values })
+        });
+        return data.data;
+    }
+
+    // 批量删除: target 为 { ids: [...] } 或 { filter: {...} }
+    async bulkDeleteWords(target) {
+        const data = await this.request('/words/bulk', {
+            method: 'DELETE',
+            body: JSON.stringify(target)
+        });
+        return data.data;
+    }
+
     async searchWords(query) {
         const data = await this.request(`/words/search?q=${encodeURIComponent(query)}`);
         return data.data || [];
     }
 
-    async batchImportWords(words) {
+    // options.mode: insert 直接插入 / skip 跳过已存在单词 / merge 更新已存在单词
+    async batchImportWords(words, options = {}) {
         const backendWords = words.map(word => ({
             content: word.word,
             meaning: word.meanings ? word.meanings.map(m => `${m.partOfSpeech} ${m.meaning}`).join('; ') : '',
@@ -166,11 +256,85 @@ class ApiService {
 
         const data = await this.request('/words/batch', {
             method: 'POST',
-            body: JSON.stringify({ words: backendWords })
+            body: JSON.stringify({ words: backendWords, ...options })
         });
         return data.data;
     }
 
+    // 流式导入 CSV/NDJSON 文件，onProgress 在每写完一块后收到当前进度
+    async streamImportWords(file, options = {}, onProgress = null) {
+        const format = options.format || (file.name && file.name.endsWith('.ndjson') ? 'ndjson' : 'csv');
+        const params = new URLSearchParams({ format, mode: options.mode || 'skip' });
+        if (options.chunkSize) {
+            params.set('chunk_size', options.chunkSize);
+        }
+
+        const headers = { 'Content-Type': format === 'ndjson' ? 'application/x-ndjson' : 'text/csv' };
+        if (this.token) {
+            headers['Authorization'] = `Bearer ${this.token}`;
+        }
+        const response = await fetch(`${this.baseURL}/words/import/stream?${params.toString()}`, {
+            method: 'POST',
+            headers,
+            body: file
+        });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        // 逐行读取进度，最后一行为汇总
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = null;
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            for (const line of lines.filter(l => l.trim())) {
+                result = JSON.parse(line);
+                if (onProgress && !result.done) {
+                    onProgress(result);
+                }
+            }
+        }
+        if (buffer.trim()) {
+            result = JSON.parse(buffer);
+        }
+        return result;
+    }
+
+    // 为一组单词生成释义选择题（服务端抽取干扰项，无需下载整个词库）
+    async getQuiz(wordIds, optionCount = 4, seed = null) {
+        const body = { word_ids: wordIds, option_count: optionCount };
+        if (seed !== null) {
+            body.seed = seed;
+        }
+        const data = await this.request('/words/quiz', {
+            method: 'POST',
+            body: JSON.stringify(body)
+        });
+        return data.data || [];
+    }
+
+    // 随机抽取单词用于背诵: options = { n, speech, exclude, seed }
+    async sampleWords(options = {}) {
+        const params = new URLSearchParams({ n: options.n || 20 });
+        if (options.speech) {
+            params.set('speech', options.speech);
+        }
+        if (options.exclude && options.exclude.length) {
+            params.set('exclude', options.exclude.join(','));
+        }
+        if (options.seed !== undefined && options.seed !== null) {
+            params.set('seed', options.seed);
+        }
+        const data = await this.request(`/words/sample?${params.toString()}`);
+        return data.data || [];
+    }
+
     // 用户相关API
     async getStudents() {
         const data = await this.request('/users/students');
@@ -182,18 +346,98 @@ class ApiService {
         return data.data || [];
     }
 
+    // 分页获取用户: options = { limit, after, sort, role, classId, q }，首页附带 total 与各角色人数
+    async getUsersPage(options = {}) {
+        const params = new URLSearchParams({ limit: options.limit || 50 });
+        if (options.after) params.set('after', options.after);
+        if (options.sort) params.set('sort', options.sort);
+        if (options.role) params.set('role', options.role);
+        if (options.classId) params.set('class_id', options.classId);
+        if (options.q) params.set('q', options.q);
+        const data = await this.request(`/users/all?${params.toString()}`);
+        return data.data || { items: [], next_cursor: null, has_more: false };
+    }
+
     // 班级相关API
     async getClasses() {
         const data = await this.request('/classes/');
         return data.data || [];
     }
 
+    async getClassStudents(classId) {
+        const data = await this.request(`/classes/${encodeURIComponent(classId)}/students`);
+        return data.data;
+    }
+
+    // 班级成绩看板：每个任务的平均分、中位数、最高分、提交率与最低分学生
+    async getClassDashboard(classId) {
+        const data = await this.request(`/classes/${encodeURIComponent(classId)}/dashboard`);
+        return data.data;
+    }
+
+    // 多个班级的看板汇总（省略 classIds 时为全部班级），一次请求取回
+    async getClassDashboards(classIds) {
+        const query = classIds ? `?class_ids=${encodeURIComponent(classIds.join(','))}` : '';
+        const data = await this.request(`/classes/dashboard${query}`);
+        return data.data || [];
+    }
+
     // 任务相关API
     async getTasks() {
         const data = await this.request('/tasks/');
         return data.data || [];
     }
 
+    // 创建任务：{ task_name, description, start_time, end_time, class_ids, word_ids | words }
+    async createTask(taskData) {
+        const data = await this.request('/tasks/', {
+            method: 'POST',
+            body: JSON.stringify(taskData)
+        });
+        return data.data;
+    }
+
+    async getTask(taskId) {
+        const data = await this.request(`/tasks/${taskId}`);
+        return data.data;
+    }
+
+    // 把任务扇出给所布置班级的学生（后台执行），返回发布状态
+    async publishTask(taskId) {
+        const data = await this.request(`/tasks/${taskId}/publish`, { method: 'POST' });
+        return data.data;
+    }
+
+    // 发布状态: { status: pending|running|done|failed, class_count, assigned_count, error }
+    async getPublishStatus(taskId) {
+        const data = await this.request(`/tasks/${taskId}/publish`);
+        return data.data;
+    }
+
+    // 按布置顺序获取任务单词（服务端以 NDJSON 逐行返回）
+    async getTaskWords(taskId) {
+        const headers = {};
+        if (this.token) {
+            headers['Authorization'] = `Bearer ${this.token}`;
+        }
+        const response = await fetch(`${this.baseURL}/tasks/${taskId}/words`, { headers });
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+        const text = await response.text();
+        return text.split('\n').filter(line => line.trim()).map(line => JSON.parse(line));
+    }
+
+    // 按时间窗口分页获取任务：window 为 active/upcoming/past，返回 { items, next_cursor, has_more }
+    async getTasksInWindow(window, options = {}) {
+        const params = new URLSearchParams({ limit: options.limit || 20 });
+        if (options.after) params.set('after', options.after);
+        if (options.classId) params.set('class_id', options.classId);
+        if (options.studentId) params.set('student_id', options.studentId);
+        const data = await this.request(`/tasks/${window}?${params.toString()}`);
+        return data.data || { items: [], next_cursor: null, has_more: false };
+    }
+
     // 成绩相关API
     async getScores() {
         const data = await this.request('/scores/');
@@ -32,7 +32,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const previewTestDetails = document.getElementById('previewTestDetails');
 
     // 模拟数据
-    const classesData = [
+    let classesData = [
         { id: 'class1', name: '计算机科学与技术1班', studentCount: 35 },
         { id: 'class2', name: '计算机科学与技术2班', studentCount: 32 },
         { id: 'class3', name: '软件工程1班', studentCount: 40 },
@@ -142,8 +142,8 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // 初始化显示
-    function initDisplay() {
-        loadClassesList();
+    async function initDisplay() {
+        await loadClassesList();
         loadTaskDraft();
     }
 
@@ -178,9 +178,21 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // 加载班级列表
-    function loadClassesList() {
+    async function loadClassesList() {
         const classesList = document.getElementById('classesList');
         
+        // 从服务器获取班级（任务按班级 ID 布置），失败时保留模拟数据
+        try {
+            const classes = await apiService.getClasses();
+            classesData = classes.map(cls => ({
+                id: cls.class_id,
+                name: cls.class_name,
+                studentCount: cls.student_count || 0
+            }));
+        } catch (error) {
+            console.error('获取班级列表失败:', error);
+        }
+        
         classesList.innerHTML = classesData.map(cls => `
             <div class="class-item">
                 <input type="checkbox" class="class-checkbox" id="class-${cls.id}" value="${cls.id}">
@@ -522,15 +534,32 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // 发布任务
-    function publishTask() {
+    async function publishTask() {
         const taskData = collectTaskData();
         
         if (!validateTaskData(taskData)) {
             return;
         }
         
-        // 生成任务ID
-        const taskId = 'task_' + Date.now();
+        // 保存到服务器：布置班级与单词表
+        let serverTask;
+        try {
+            serverTask = await apiService.createTask({
+                task_name: taskData.name,
+                description: taskData.description,
+                start_time: taskData.startTime,
+                end_time: taskData.endTime,
+                class_ids: taskData.classes,
+                words: taskData.words.map(word => word.word)
+            });
+        } catch (error) {
+            console.error('任务保存到服务器失败:', error);
+            alert(error.status ? `任务发布失败: ${error.message}` : '任务发布失败，请检查班级和时间设置后重试');
+            return;
+        }
+        
+        // 服务器任务ID
+        const taskId = serverTask.task_id;
         const taskWithId = {
             ...taskData,
             id: taskId,
@@ -539,7 +568,7 @@ document.addEventListener('DOMContentLoaded', function() {
             teacher: JSON.parse(localStorage.getItem('currentUser')).username
         };
         
-        // 保存到本地存储（实际项目中应该发送到服务器）
+        // 本地副本供学生任务页展示进度（单词表以服务器为准）
         let tasks = JSON.parse(localStorage.getItem('teacherTasks')) || [];
         tasks.push(taskWithId);
         localStorage.setItem('teacherTasks', JSON.stringify(tasks));
@@ -548,8 +577,16 @@ document.addEventListener('DOMContentLoaded', function() {
         localStorage.removeItem('taskDraft');
         currentState.taskDraft = null;
         
-        // 显示成功消息
-        alert('任务发布成功！');
+        // 显示结果（学生布置记录在后台生成，可通过发布状态接口查看进度）；词库中找不到的单词已被跳过，需要告知老师
+        const messages = [];
+        if (serverTask.missing_words && serverTask.missing_words.length > 0) {
+            messages.push(`以下 ${serverTask.missing_words.length} 个单词不在词库中，已跳过: ${serverTask.missing_words.join(', ')}`);
+            messages.push(`任务实际包含 ${serverTask.word_count} 个单词`);
+        }
+        messages.push(serverTask.publish && serverTask.publish.status === 'failed'
+            ? `任务已保存，但分发给学生失败: ${serverTask.publish.error}`
+            : '任务发布成功！学生任务正在后台生成');
+        alert(messages.join('\n'));
         
         // 关闭模态框并返回
         closePreviewModal();
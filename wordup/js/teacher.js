@@ -8,7 +8,7 @@ document.addEventListener('DOMContentLoaded', async function() {
     const activeTasks = document.getElementById('activeTasks');
     const totalTasks = document.getElementById('totalTasks');
     const studentParticipation = document.getElementById('studentParticipation');
-    const averageCompletion = document.getElementById('averageCompletion');
+    const averageScore = document.getElementById('averageScore');
     
     // 列表元素
     const recentTasks = document.getElementById('recentTasks');
@@ -72,16 +72,36 @@ document.addEventListener('DOMContentLoaded', async function() {
 
     // 更新仪表板
     async function updateDashboard() {
-        await updateStatistics();
-        await updateRecentTasks();
-        await updateClassesOverview();
+        const [classes, tasks] = await Promise.all([loadClassDashboards(), loadTasks()]);
+        updateStatistics(classes, tasks);
+        updateRecentTasks(tasks);
+        updateClassesOverview(classes);
         updateActivityList(); // 活动列表暂时使用模拟数据
     }
 
+    // 获取各班级及其看板汇总（一次请求，统计由后端完成）
+    async function loadClassDashboards() {
+        try {
+            return await apiService.getClassDashboards();
+        } catch (error) {
+            console.error('获取班级看板失败:', error);
+            return [];
+        }
+    }
+
+    // 获取任务列表（统计与近期任务共用一次请求）
+    async function loadTasks() {
+        try {
+            return await apiService.getTasks();
+        } catch (error) {
+            console.error('获取任务列表失败:', error);
+            return [];
+        }
+    }
+
     // 更新统计信息
-    async function updateStatistics() {
+    function updateStatistics(classes, tasks) {
         try {
-            const tasks = await apiService.getTasks();
             const now = new Date();
             
             // 进行中任务
@@ -94,73 +114,35 @@ document.addEventListener('DOMContentLoaded', async function() {
             // 总任务数
             const totalTasksCount = tasks.length;
             
-            // 计算学生参与率和平均完成率（模拟数据）
-            // 注意：这些数据需要后端提供专门的统计API
-            const participationRate = calculateParticipationRate(tasks);
-            const avgCompletionRate = calculateAverageCompletionRate(tasks);
+            // 学生参与率取各班平均提交率，平均成绩取各班任务平均分
+            const participationRate = averageOf(classes, summary => summary.submission_rate * 100);
+            const avgScore = averageOf(classes, summary => summary.average);
             
             // 更新显示
             if (activeTasks) activeTasks.textContent = activeTasksCount;
             if (totalTasks) totalTasks.textContent = totalTasksCount;
             if (studentParticipation) studentParticipation.textContent = `${participationRate}%`;
-            if (averageCompletion) averageCompletion.textContent = `${avgCompletionRate}%`;
+            if (averageScore) averageScore.textContent = avgScore;
         } catch (error) {
             console.error('更新统计信息失败:', error);
         }
     }
 
-    // 计算学生参与率（模拟）
-    function calculateParticipationRate(tasks) {
-        if (tasks.length === 0) return 0;
-        
-        // 模拟计算 - 实际项目中应该从服务器获取真实数据
-        let totalParticipation = 0;
-        tasks.forEach(task => {
-            // 基于任务状态和时间模拟参与率
-            const now = new Date();
-            const endTime = new Date(task.end_time);
-            const startTime = new Date(task.start_time);
-            let timePassed = (now - startTime) / (endTime - startTime);
-            
-            if (timePassed < 0) timePassed = 0;
-            if (timePassed > 1) timePassed = 1;
-            
-            const baseRate = 70; // 基础参与率
-            const randomFactor = Math.random() * 20 - 10; // -10 到 +10 的随机变化
-            const taskParticipation = Math.min(100, Math.max(0, baseRate + randomFactor));
-            
-            totalParticipation += taskParticipation;
-        });
-        
-        return Math.round(totalParticipation / tasks.length);
-    }
-
-    // 计算平均完成率（模拟）
-    function calculateAverageCompletionRate(tasks) {
-        if (tasks.length === 0) return 0;
-        
-        // 模拟计算 - 实际项目中应该从服务器获取真实数据
-        let totalCompletion = 0;
-        tasks.forEach(task => {
-            // 基于任务难度和类型模拟完成率
-            let baseRate = 70; // 默认完成率
-            
-            const randomFactor = Math.random() * 20 - 10; // -10 到 +10 的随机变化
-            const taskCompletion = Math.min(100, Math.max(0, baseRate + randomFactor));
-            
-            totalCompletion += taskCompletion;
-        });
-        
-        return Math.round(totalCompletion / tasks.length);
+    // 对有成绩的班级看板汇总值取平均
+    function averageOf(classes, pick) {
+        const values = classes
+            .filter(cls => cls.summary && cls.summary.task_count > 0)
+            .map(cls => pick(cls.summary))
+            .filter(value => value !== null && value !== undefined);
+        if (values.length === 0) return 0;
+        return Math.round(values.reduce((sum, value) => sum + value, 0) / values.length);
     }
 
     // 更新近期任务列表
-    async function updateRecentTasks() {
+    function updateRecentTasks(tasks) {
         try {
-            const tasks = await apiService.getTasks();
-            
             // 按发布时间排序，取最近5个
-            const recentTasksList = tasks
+            const recentTasksList = [...tasks]
                 .sort((a, b) => new Date(b.start_time) - new Date(a.start_time))
                 .slice(0, 5);
             
@@ -208,10 +190,8 @@ document.addEventListener('DOMContentLoaded', async function() {
     }
 
     // 更新班级概览
-    async function updateClassesOverview() {
+    function updateClassesOverview(classes) {
         try {
-            const classes = await apiService.getClasses();
-            
             if (!classesOverview) return;
 
             if (classes.length === 0) {
@@ -226,8 +206,8 @@ document.addEventListener('DOMContentLoaded', async function() {
             }
             
             classesOverview.innerHTML = classes.map(cls => {
-                // 模拟完成率，实际应该从后端获取
-                const completionRate = Math.floor(Math.random() * 30) + 70; // 70-100%的随机完成率
+                const summary = cls.summary;
+                const completionRate = summary ? Math.round(summary.submission_rate * 100) : 0;
                 
                 return `
                     <div class="task-item">
@@ -239,7 +219,7 @@ document.addEventListener('DOMContentLoaded', async function() {
                             <div class="progress-bar">
                                 <div class="progress-fill" style="width: ${completionRate}%"></div>
                             </div>
-                            <div class="progress-text">平均完成率: ${completionRate}%</div>
+                            <div class="progress-text">平均提交率: ${completionRate}%</div>
                         </div>
                     </div>
                 `;
@@ -17,6 +17,8 @@ document.addEventListener('DOMContentLoaded', async function() {
     const searchUser = document.getElementById('searchUser');
     const searchBtn = document.getElementById('searchBtn');
     const roleFilter = document.getElementById('roleFilter');
+    const classFilter = document.getElementById('classFilter');
+    const loadMoreBtn = document.getElementById('loadMoreUsers');
     
     // 统计元素
     const totalUsers = document.getElementById('totalUsers');
@@ -31,7 +33,9 @@ document.addEventListener('DOMContentLoaded', async function() {
 
     // 状态变量
     let currentEditingUser = null;
-    let allUsers = [];
+    let allUsers = [];          // 已加载的用户（当前筛选条件下的前几页）
+    let nextCursor = null;      // 下一页游标，null 表示已加载完
+    const PAGE_SIZE = 50;
 
     // 初始化应用
     async function initializeApp() {
@@ -52,6 +56,7 @@ document.addEventListener('DOMContentLoaded', async function() {
             }
 
             initEventListeners();
+            await loadClassOptions();
             await loadUsers();
             
             console.log('用户管理页面初始化完成');
@@ -126,6 +131,18 @@ document.addEventListener('DOMContentLoaded', async function() {
             roleFilter.addEventListener('change', filterUsers);
         }
 
+        // 班级过滤
+        if (classFilter && !classFilter.hasAttribute('data-bound')) {
+            classFilter.setAttribute('data-bound', 'true');
+            classFilter.addEventListener('change', filterUsers);
+        }
+
+        // 加载下一页
+        if (loadMoreBtn && !loadMoreBtn.hasAttribute('data-bound')) {
+            loadMoreBtn.setAttribute('data-bound', 'true');
+            loadMoreBtn.addEventListener('click', () => loadUsers(true));
+        }
+
         // 点击模态框背景关闭
         if (userModal && !userModal.hasAttribute('data-bound')) {
             userModal.setAttribute('data-bound', 'true');
@@ -284,30 +301,56 @@ document.addEventListener('DOMContentLoaded', async function() {
         }
     }
 
-    // 加载用户数据 - 使用真实API
-    async function loadUsers() {
+    // 班级过滤下拉框
+    async function loadClassOptions() {
+        if (!classFilter) return;
         try {
-            console.log('从后端加载用户数据...');
-            
-            // 调用后端API获取所有用户
-            const response = await apiService.request('/users/all');
+            const classes = await apiService.getClasses();
+            classFilter.innerHTML = '<option value="">所有班级</option>' + classes.map(cls =>
+                `<option value="${cls.class_id}">${cls.class_name}</option>`
+            ).join('');
+        } catch (error) {
+            console.error('获取班级列表失败:', error);
+        }
+    }
+
+    // 当前的服务器端筛选条件（角色、班级、姓名/账号前缀）
+    function currentFilters() {
+        const role = roleFilter ? roleFilter.value : 'all';
+        return {
+            role: role === 'all' ? '' : role,
+            classId: classFilter ? classFilter.value : '',
+            q: searchUser ? searchUser.value.trim() : ''
+        };
+    }
+
+    // 分页加载用户：筛选与计数由后端完成，每次只取一页；append 为 true 时追加下一页
+    async function loadUsers(append = false) {
+        try {
+            const filters = currentFilters();
+            const page = await apiService.getUsersPage({
+                ...filters,
+                limit: PAGE_SIZE,
+                after: append ? nextCursor : null
+            });
             
-            if (response.success) {
-                allUsers = response.data || [];
-                console.log('获取到的用户数据:', allUsers);
-                displayUsers(allUsers);
-                updateStatistics(allUsers);
-            } else {
-                throw new Error(response.message || '获取用户数据失败');
+            allUsers = append ? allUsers.concat(page.items) : page.items;
+            nextCursor = page.has_more ? page.next_cursor : null;
+            displayUsers(allUsers);
+            // 计数只在首页返回
+            if (page.counts) {
+                updateStatistics(page, !filters.role && !filters.classId && !filters.q);
             }
-
         } catch (error) {
             console.error('加载用户数据失败:', error);
             alert('加载用户数据失败: ' + error.message);
-            // 降级方案：使用空数组
-            allUsers = [];
-            displayUsers(allUsers);
-            updateStatistics(allUsers);
+            if (!append) {
+                allUsers = [];
+                nextCursor = null;
+                displayUsers(allUsers);
+            }
+        } finally {
+            if (loadMoreBtn) loadMoreBtn.classList.toggle('hidden', !nextCursor);
         }
     }
 
@@ -406,50 +449,25 @@ document.addEventListener('DOMContentLoaded', async function() {
         }
     }
 
-    // 更新统计信息
-    function updateStatistics(users) {
-        if (!users) return;
-
-        const total = users.length;
-        const admins = users.filter(u => u.role === 'admin').length;
-        const teachers = users.filter(u => u.role === 'teacher').length;
-        const students = users.filter(u => u.role === 'student').length;
+    // 更新统计信息：列表总数取当前筛选结果，各角色人数只在未筛选时更新
+    function updateStatistics(page, unfiltered) {
+        if (listCount) listCount.textContent = page.total;
+        if (!unfiltered) return;
 
-        if (totalUsers) totalUsers.textContent = total;
-        if (adminCount) adminCount.textContent = admins;
-        if (teacherCount) teacherCount.textContent = teachers;
-        if (studentCount) studentCount.textContent = students;
-        if (listCount) listCount.textContent = total;
+        if (totalUsers) totalUsers.textContent = page.total;
+        if (adminCount) adminCount.textContent = page.counts.admin;
+        if (teacherCount) teacherCount.textContent = page.counts.teacher;
+        if (studentCount) studentCount.textContent = page.counts.student;
     }
 
-    // 执行搜索
+    // 执行搜索（姓名或账号前缀，由后端筛选）
     function performSearch() {
-        const searchTerm = searchUser.value.toLowerCase().trim();
-        if (!searchTerm) {
-            displayUsers(allUsers);
-            return;
-        }
-
-        const filteredUsers = allUsers.filter(user => 
-            user.name.toLowerCase().includes(searchTerm) ||
-            user.account.toLowerCase().includes(searchTerm) ||
-            user.user_id.toLowerCase().includes(searchTerm) ||
-            (user.email && user.email.toLowerCase().includes(searchTerm)) ||
-            (user.class_id && user.class_id.toLowerCase().includes(searchTerm))
-        );
-
-        displayUsers(filteredUsers);
+        loadUsers();
     }
 
-    // 过滤用户
+    // 过滤用户（角色、班级，由后端筛选）
     function filterUsers() {
-        const role = roleFilter.value;
-        if (role === 'all') {
-            displayUsers(allUsers);
-        } else {
-            const filteredUsers = allUsers.filter(user => user.role === role);
-            displayUsers(filteredUsers);
-        }
+        loadUsers();
     }
 
     // 启动应用
@@ -653,26 +653,10 @@ document.addEventListener('DOMContentLoaded', async function() {
                 return;
             }
 
-            let addedCount = 0;
-            let errorCount = 0;
-
-            for (const wordData of importedWords) {
-                try {
-                    // 检查单词是否已存在
-                    const existingWords = await apiService.getWords();
-                    const exists = existingWords.some(w => 
-                        w.content.toLowerCase() === wordData.word.toLowerCase()
-                    );
-                    
-                    if (!exists) {
-                        await apiService.addWord(wordData);
-                        addedCount++;
-                    }
-                } catch (error) {
-                    console.error(`导入单词失败 ${wordData.word}:`, error);
-                    errorCount++;
-                }
-            }
+            // 服务端按拼写（忽略大小写）去重，一次请求完成导入
+            const result = await apiService.batchImportWords(importedWords, { mode: 'skip' });
+            const addedCount = result ? result.inserted : 0;
+            const errorCount = result ? result.failed : 0;
 
             // 更新显示
             await loadWords();